@@ -0,0 +1,142 @@
+import dataclasses
+import mimetypes
+import os
+import re
+from functools import cached_property
+from typing import Iterator
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.request import Request
+
+__all__ = [
+    'FileDownload',
+    'FileDownloadMode',
+]
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileDownloadMode:
+    """Режимы отдачи файлов."""
+
+    # Файл отдается процессом Django
+    PYTHON = 'python'
+    # Файл отдает nginx из internal location по заголовку X-Accel-Redirect
+    X_ACCEL = 'x-accel'
+
+
+@dataclasses.dataclass
+class FileDownload:
+    """Ответ на скачивание файла из хранилища.
+
+    Поддерживает условные запросы (ETag/Last-Modified) и, в режиме python, запрос
+    одного диапазона байт (Range). В режиме x-accel тело ответа и диапазоны отдает nginx.
+    """
+
+    request: Request
+    file: FieldFile
+
+    CHUNK_SIZE = 64 * 1024
+
+    @cached_property
+    def stat(self) -> os.stat_result:
+        return os.stat(self.file.path)
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file.name)
+
+    @property
+    def content_type(self) -> str:
+        mime_type, _ = mimetypes.guess_type(self.file.name)
+        return mime_type or 'application/octet-stream'
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.stat.st_size:x}-{self.stat.st_mtime_ns:x}"'
+
+    @property
+    def last_modified(self) -> int:
+        return int(self.stat.st_mtime)
+
+    def response(self) -> HttpResponseBase:
+        response = get_conditional_response(self.request, etag=self.etag, last_modified=self.last_modified)
+        if response is None:
+            if settings.FILE_ATTACHMENT_DOWNLOAD_MODE == FileDownloadMode.X_ACCEL:
+                response = self._accel_response()
+            else:
+                response = self._python_response()
+            response['Content-Disposition'] = f'attachment; filename="{self.file_name}"'
+            response['Accept-Ranges'] = 'bytes'
+
+        response['ETag'] = self.etag
+        response['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+    def _accel_response(self) -> HttpResponse:
+        response = HttpResponse(content_type=self.content_type)
+        response['X-Accel-Redirect'] = settings.FILE_ATTACHMENT_ACCEL_REDIRECT_LOCATION + quote(self.file.name)
+        return response
+
+    def _python_response(self) -> HttpResponseBase:
+        size = self.stat.st_size
+        byte_range = self._get_range(size)
+        if byte_range is None:
+            response = FileResponse(open(self.file.path, 'rb'), content_type=self.content_type)
+            response['Content-Length'] = size
+            return response
+
+        if byte_range is False:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            self._iter_range(start, end),
+            status=status.HTTP_206_PARTIAL_CONTENT,
+            content_type=self.content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+        return response
+
+    def _get_range(self, size: int) -> tuple[int, int] | bool | None:
+        """Возвращает диапазон (start, end), False для невыполнимого диапазона или None для всего файла."""
+        header = self.request.META.get('HTTP_RANGE', '').strip()
+        match = RANGE_RE.match(header)
+        if not match or not any(match.groups()):
+            # Несколько диапазонов и прочие единицы не поддерживаются - отдаем весь файл
+            return None
+
+        if_range = self.request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range != self.etag and parse_http_date_safe(if_range) != self.last_modified:
+            return None
+
+        first, last = match.groups()
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    def _iter_range(self, start: int, end: int) -> Iterator[bytes]:
+        with open(self.file.path, 'rb') as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(self.CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
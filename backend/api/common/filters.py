@@ -0,0 +1,18 @@
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+__all__ = [
+    'OwnerFilterBackend',
+]
+
+
+class OwnerFilterBackend(BaseFilterBackend):
+    """Ограничивает queryset объектами текущего пользователя.
+
+    Путь до владельца берется из атрибута owner_lookup модели, проверка выполняется в том же запросе.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view: APIView) -> QuerySet:
+        return queryset.filter(**{queryset.model.owner_lookup: request.user})
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+__all__ = [
+    'KeysetPagination',
+]
+
+
+class KeysetPagination(CursorPagination):
+    """Пагинация по ключу (-created_at, id).
+
+    В отличие от постраничной пагинации не выполняет COUNT(*) и OFFSET, поэтому стоимость
+    получения любой страницы одинакова. Курсор следующей/предыдущей страницы передается в параметре cursor.
+    """
+
+    ordering = ('-created_at', 'id')
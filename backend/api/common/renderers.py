@@ -0,0 +1,37 @@
+from typing import Any, Mapping
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+__all__ = [
+    'ORJSONRenderer',
+]
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON рендерер на orjson.
+
+    Типы, которые orjson не сериализует сам (Decimal, ленивые строки переводов, QuerySet и т.д.),
+    а также datetime передаются в encoder_class DRF, поэтому вывод совпадает с JSONRenderer.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        content = orjson.dumps(data, default=self.encoder_class().default, option=options)
+        # Как и JSONRenderer, экранируем разделители строк, недопустимые в JavaScript
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
@@ -1,7 +1,14 @@
-from typing import Dict
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Any, Dict
 
+from django.db.models import QuerySet
 from rest_framework import serializers
 
+from api.common.types import SparseFieldset
+
+SPARSE_FIELDSET_CONTEXT_KEY = 'sparse_fieldset'
+
 
 class BaseSerializer(serializers.ModelSerializer):
     """Базовый сериализатор."""
@@ -11,3 +18,68 @@ class BaseSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             attrs.setdefault('updated_by', request.user)
         return attrs
+
+
+class SparseFieldsetSerializerMixin:
+    """Ограничивает поля ответа разреженным набором полей из контекста сериализатора.
+
+    Поля не из fields удаляются, вложенные сериализаторы не из expand заменяются на id связанных объектов.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get(SPARSE_FIELDSET_CONTEXT_KEY)
+        if fieldset is not None:
+            self.apply_sparse_fieldset(fieldset)
+
+    def apply_sparse_fieldset(self, fieldset: SparseFieldset) -> None:
+        for field_name, field in list(self.fields.items()):
+            if not fieldset.includes(field_name):
+                self.fields.pop(field_name)
+            elif not fieldset.expands(field_name) and isinstance(field, serializers.BaseSerializer):
+                self.fields[field_name] = self._get_pk_field(field_name, field)
+
+    @staticmethod
+    def _get_pk_field(field_name: str, field: serializers.BaseSerializer) -> serializers.Field:
+        kwargs = {'read_only': True}
+        if field.source != field_name:
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+def decimal_to_representation(value: Decimal | None, decimal_places: int) -> str | None:
+    """Строковое представление Decimal, совпадающее с serializers.DecimalField."""
+    if value is None:
+        return None
+    return f'{value.quantize(Decimal(1).scaleb(-decimal_places)):f}'
+
+
+class FlatListSerializer(ABC):
+    """Сериализатор списков из строк QuerySet.values() в обход полей DRF.
+
+    Колонки страницы перечисляются в values_fields, связанные данные загружаются в load_related
+    одним запросом на связь для всей страницы. Вывод совпадает с обычным сериализатором ответа list,
+    что проверяется тестами паритета.
+    """
+
+    values_fields: tuple[str, ...] = ()
+
+    def __init__(self, context: dict | None = None) -> None:
+        self.context = {} if context is None else context
+
+    def get_queryset(self, queryset: QuerySet) -> QuerySet:
+        return queryset.select_related(None).prefetch_related(None).values(*self.values_fields)
+
+    def to_representation(self, rows: list[dict]) -> list[dict]:
+        related = self.load_related(rows)
+        return [self.to_row_representation(row, related) for row in rows]
+
+    def load_related(self, rows: list[dict]) -> dict:
+        """Загружает связанные данные страницы."""
+        return {}
+
+    @abstractmethod
+    def to_row_representation(self, row: dict, related: dict) -> dict:
+        """Представление одной строки страницы."""
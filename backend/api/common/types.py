@@ -23,3 +23,22 @@ class SerializerMapping:
     partial_update: SerializerTypeMapping | None = None
     delete: SerializerTypeMapping | None = None
     actions: dict[str:SerializerTypeMapping] = {}
+
+
+@dataclass(frozen=True)
+class SparseFieldset:
+    """Разреженный набор полей ответа из параметров запроса fields и expand.
+
+    None означает отсутствие ограничения: все поля ответа и все вложенные объекты.
+    """
+
+    fields: frozenset[str] | None = None
+    expand: frozenset[str] | None = None
+
+    def includes(self, field_name: str) -> bool:
+        """Поле входит в ответ."""
+        return self.fields is None or field_name in self.fields
+
+    def expands(self, field_name: str) -> bool:
+        """Вложенное поле отдается объектом, а не id."""
+        return self.expand is None or field_name in self.expand
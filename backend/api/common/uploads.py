@@ -0,0 +1,31 @@
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http import HttpRequest
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+__all__ = [
+    'MaxSizeUploadHandler',
+]
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """Прерывает разбор multipart-запроса, как только загружаемый файл превышает max_size.
+
+    Ставится первым в списке обработчиков загрузки: размер считается по мере чтения частей,
+    поэтому слишком большой файл не дочитывается в память или во временный файл.
+    """
+
+    def __init__(self, request: HttpRequest | None = None, *, max_size: int) -> None:
+        super().__init__(request)
+        self.max_size = max_size
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        if start + len(raw_data) > self.max_size:
+            raise serializers.ValidationError(
+                {self.field_name: _('Размер файла превышает допустимый: ') + filesizeformat(self.max_size)}
+            )
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        return None
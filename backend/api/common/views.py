@@ -1,14 +1,26 @@
-from typing import Any, Type
+import hashlib
+from typing import Any, Callable, Type
 
-from django.db.models import Model
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max, Model, Prefetch, QuerySet
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.translation import get_language
 from rest_framework import mixins, status
+from rest_framework.pagination import BasePagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.viewsets import GenericViewSet
 
 from api.common.enums import SerializerType
-from api.common.types import SerializerMapping, SerializerTypeMapping
+from api.common.filters import OwnerFilterBackend
+from api.common.pagination import KeysetPagination
+from api.common.serializers import SPARSE_FIELDSET_CONTEXT_KEY, FlatListSerializer
+from api.common.types import SerializerMapping, SerializerTypeMapping, SparseFieldset
+from apps.common.cache import owner_cache_version
+from apps.unit.catalogue import unit_catalogue
 
 
 class BaseGenericViewSet(GenericViewSet):
@@ -52,6 +64,251 @@ class ExUpdateModelMixin:
         return serializer.save()
 
 
+class ListResponseCacheMixin:
+    """Кэширование ответов list в общем кэше.
+
+    Ключ включает пользователя, язык, URL запроса с параметрами, версию данных владельца
+    и версию каталога ед. измерений. Изменение данных повышает версию владельца
+    (см. apps.warehouse.signals), и старые ответы перестают читаться. Для общих для всех
+    пользователей данных (response_cache_per_owner = False) пользователь и версия владельца
+    в ключ не входят.
+    """
+
+    response_cache_actions = ('list',)
+    # False для общих для всех пользователей данных
+    response_cache_per_owner = True
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(
+        self, handler: Callable[..., Response], request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        if self.action not in self.response_cache_actions:
+            return handler(request, *args, **kwargs)
+
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    def get_response_cache_key(self, request: Request) -> str:
+        owner = (
+            f'{request.user.id}:{owner_cache_version.get(request.user.id)}' if self.response_cache_per_owner else '-'
+        )
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return ':'.join(
+            [
+                'response',
+                self.__class__.__name__,
+                self.action,
+                owner,
+                get_language(),
+                str(unit_catalogue.snapshot.version),
+                path,
+            ]
+        )
+
+
+class ResponseCacheMixin(ListResponseCacheMixin):
+    """Кэширование ответов list/retrieve в общем кэше, см. ListResponseCacheMixin."""
+
+    response_cache_actions = ('list', 'retrieve')
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class FlatListMixin:
+    """Быстрый путь list: ответ собирается из строк .values() плоским сериализатором.
+
+    Включается атрибутом flat_list_serializer_class. Для разреженного набора полей (fields/expand)
+    используется обычный сериализатор ответа.
+    """
+
+    flat_list_serializer_class: type[FlatListSerializer] | None = None
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        if self.flat_list_serializer_class is None or self.get_sparse_fieldset() is not None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.flat_list_serializer_class(context=self.get_serializer_context())
+        queryset = serializer.get_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(list(queryset)))
+
+
+class ConditionalGetMixin:
+    """Поддержка ETag и условных GET (If-None-Match) для list/retrieve.
+
+    ETag строится из пользователя, версии данных владельца, версии каталога ед. измерений, языка, URL
+    и состояния выборки в БД: max(updated_at) по отфильтрованной выборке (для retrieve - время
+    изменения объекта), у моделей без времени изменения - количество строк. COUNT для выборок
+    с временем изменения не нужен: удаление повышает версию владельца.
+
+    Запрос с If-None-Match всегда сверяется с БД одним агрегирующим запросом и при совпадении
+    получает 304 без загрузки и сериализации объектов. Для остальных запросов ETag берется из общего
+    кэша по тем же версиям, поэтому закэшированные ответы отдаются без обращения к БД.
+    """
+
+    conditional_get_actions = ('list', 'retrieve')
+    # Поле времени изменения объекта, None для моделей без него
+    conditional_get_updated_field: str | None = 'updated_at'
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(
+        self, handler: Callable[..., Response], request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        if self.action not in self.conditional_get_actions:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                # ETag выдается только успешным ответам, поэтому 304 не скрывает 403/404
+                return response
+        response['ETag'] = etag
+        return response
+
+    def get_etag(self, request: Request) -> str | None:
+        """Возвращает ETag ответа или None, если ответ не подлежит условному запросу."""
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = self.get_etag_cache_key(request)
+        if 'If-None-Match' not in request.headers:
+            etag = cache.get(key)
+            if etag is not None:
+                return etag
+
+        state = self.get_etag_state()
+        if state is None:
+            return None
+        etag = f'"{hashlib.md5(f"{key}:{state}".encode()).hexdigest()}"'
+        cache.set(key, etag, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+        return etag
+
+    def get_etag_cache_key(self, request: Request) -> str:
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return ':'.join(
+            [
+                'etag',
+                self.__class__.__name__,
+                self.action,
+                str(request.user.id),
+                str(owner_cache_version.get(request.user.id)),
+                get_language(),
+                str(unit_catalogue.snapshot.version),
+                path,
+            ]
+        )
+
+    def get_etag_state(self) -> str | None:
+        """Состояние выборки ответа в БД одним агрегирующим запросом."""
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            except (TypeError, ValueError):
+                return None
+
+        if self.conditional_get_updated_field is None:
+            return str(queryset.aggregate(count=Count('pk'))['count'])
+        return str(queryset.aggregate(updated_at=Max(self.conditional_get_updated_field))['updated_at'])
+
+
+class KeysetPaginationMixin:
+    """Миксин включающий пагинацию по ключу по параметру запроса pagination=keyset."""
+
+    PAGINATION_QUERY_PARAM = 'pagination'
+    KEYSET_PAGINATION = 'keyset'
+
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            pagination = request.query_params.get(self.PAGINATION_QUERY_PARAM) if request is not None else None
+            if pagination == self.KEYSET_PAGINATION:
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+
+class ParentOwnerViewSetMixin:
+    """Миксин вложенного ViewSet, объекты которого ограничены родителем из URL и владельцем.
+
+    Родитель и владелец проверяются в SQL запроса объектов, без отдельной загрузки родителя.
+    Родитель запрашивается только при пустом результате, чтобы вернуть 404 для несуществующего
+    и 403 для чужого родителя.
+    """
+
+    parent_model: type[Model]
+    # Параметр URL с id родителя
+    parent_url_kwarg: str
+    # Поле объекта со ссылкой на родителя
+    parent_lookup: str
+
+    filter_backends = [OwnerFilterBackend]
+
+    @property
+    def parent_id(self) -> str | None:
+        return self.kwargs.get(self.parent_url_kwarg)
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        try:
+            return queryset.filter(**{self.parent_lookup: self.parent_id})
+        except (TypeError, ValueError):
+            raise Http404
+
+    def paginate_queryset(self, queryset: QuerySet) -> list | None:
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.check_parent_permissions()
+        return page
+
+    def get_object(self) -> Model:
+        try:
+            return super().get_object()
+        except Http404:
+            self.check_parent_permissions()
+            raise
+
+    def check_parent_permissions(self) -> None:
+        try:
+            owner_id = (
+                self.parent_model.objects.filter(pk=self.parent_id)
+                .values_list(self.parent_model.owner_lookup, flat=True)
+                .first()
+            )
+        except (TypeError, ValueError):
+            raise Http404
+        if owner_id is None:
+            raise Http404
+        if owner_id != self.request.user.id:
+            self.permission_denied(self.request)
+
+
 class SerializerViewSetMixin:
     """Миксин позволяющий использовать разные сериализаторы для запроса и ответа.
     Используется для ручек для frontend части.
@@ -59,6 +316,9 @@ class SerializerViewSetMixin:
 
     serializers: SerializerMapping
 
+    FIELDS_QUERY_PARAM = 'fields'
+    EXPAND_QUERY_PARAM = 'expand'
+
     @staticmethod
     def _none(*args: Any, **kwargs: Any) -> None:
         return None
@@ -82,10 +342,64 @@ class SerializerViewSetMixin:
         if serializer_class is None:
             raise ValueError('Serializer class not found')
         kwargs.setdefault('context', self.get_serializer_context())
+        if serializer_type == SerializerType.RESPONSE:
+            kwargs['context'].setdefault(SPARSE_FIELDSET_CONTEXT_KEY, self.get_sparse_fieldset())
         return serializer_class(*args, **kwargs)
 
+    def get_sparse_fieldset(self) -> SparseFieldset | None:
+        """Разреженный набор полей ответа из параметров fields и expand (id,title,...)."""
+        request = getattr(self, 'request', None)
+        if request is None:
+            return None
+
+        params = request.query_params
+        if self.FIELDS_QUERY_PARAM not in params and self.EXPAND_QUERY_PARAM not in params:
+            return None
+        return SparseFieldset(
+            fields=self._parse_field_names(params.get(self.FIELDS_QUERY_PARAM)),
+            expand=self._parse_field_names(params.get(self.EXPAND_QUERY_PARAM)) or frozenset(),
+        )
+
+    @staticmethod
+    def _parse_field_names(value: str | None) -> frozenset[str] | None:
+        if value is None:
+            return None
+        return frozenset(name.strip() for name in value.split(',') if name.strip())
+
+    def select_response_related(
+        self,
+        queryset: QuerySet,
+        *,
+        select_related: tuple[str, ...] = (),
+        prefetch_related: tuple[str, ...] = (),
+    ) -> QuerySet:
+        """Загружает связи, нужные полям ответа, с учетом разреженного набора полей.
+
+        Имя связи совпадает с полем ответа. Связи полей вне ответа не загружаются, для связей,
+        отдаваемых id, внешний ключ не присоединяется, а many-to-many загружаются только с id.
+        """
+        fieldset = self.get_sparse_fieldset()
+        if fieldset is None:
+            return queryset.select_related(*select_related).prefetch_related(*prefetch_related)
+
+        for name in select_related:
+            if fieldset.includes(name) and fieldset.expands(name):
+                queryset = queryset.select_related(name)
+        for name in prefetch_related:
+            if not fieldset.includes(name):
+                continue
+            if fieldset.expands(name):
+                queryset = queryset.prefetch_related(name)
+            else:
+                related_model = queryset.model._meta.get_field(name).related_model
+                queryset = queryset.prefetch_related(Prefetch(name, queryset=related_model.objects.only('pk')))
+        return queryset
+
 
 class BaseModelViewSet(
+    ConditionalGetMixin,
+    ResponseCacheMixin,
+    FlatListMixin,
     SerializerViewSetMixin,
     ExCreateModelMixin,
     ExUpdateModelMixin,
@@ -1,7 +1,10 @@
+from .convert import UnitConversionItemSerializer, UnitConvertSerializer
 from .unit import UnitGroupSerializer, UnitSerializer
 
 
 __all__ = [
     'UnitSerializer',
     'UnitGroupSerializer',
+    'UnitConvertSerializer',
+    'UnitConversionItemSerializer',
 ]
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.unit.catalogue import unit_catalogue
+from apps.unit.converter import unit_converter
+
+
+class UnitConversionItemSerializer(serializers.Serializer):
+    value = serializers.DecimalField(max_digits=20, decimal_places=6)
+    from_unit = serializers.IntegerField(min_value=1)
+    to_unit = serializers.IntegerField(min_value=1)
+    result = serializers.DecimalField(max_digits=30, decimal_places=6, read_only=True)
+
+
+class UnitConvertSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=UnitConversionItemSerializer(),
+        min_length=1,
+        max_length=settings.UNIT_CONVERT_MAX_ITEMS,
+    )
+
+    def validate_items(self, items: list[dict]) -> list[dict]:
+        errors = {}
+        for i, item in enumerate(items):
+            result = unit_converter.convert(item['value'], item['from_unit'], item['to_unit'])
+            if result is not None:
+                item['result'] = result
+                continue
+
+            if unit_catalogue.get_unit(item['from_unit']) is None:
+                errors[i] = {'from_unit': _('Единица измерения не найдена')}
+            elif unit_catalogue.get_unit(item['to_unit']) is None:
+                errors[i] = {'to_unit': _('Единица измерения не найдена')}
+            else:
+                errors[i] = {'to_unit': _('Единица измерения из другой группы')}
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return items
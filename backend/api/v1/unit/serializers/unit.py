@@ -1,10 +1,18 @@
 from rest_framework import serializers
 
 from apps.unit.models import Unit, UnitGroup
-from apps.unit.services import UnitTranslationService
+from apps.unit.services import UnitTranslationResolver
 
 
-class UnitGroupSerializer(serializers.ModelSerializer):
+class UnitTranslationSerializerMixin:
+    """Предоставляет сериализаторам резолвер переводов ед. измерений текущего запроса."""
+
+    @property
+    def translation_resolver(self) -> UnitTranslationResolver:
+        return UnitTranslationResolver.from_context(self.context)
+
+
+class UnitGroupSerializer(UnitTranslationSerializerMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
 
     class Meta:
@@ -14,14 +22,11 @@ class UnitGroupSerializer(serializers.ModelSerializer):
             'title',
         ]
 
-    def get_title(self, obj: UnitGroup) -> str:
-        translation = UnitTranslationService.get_unit_group_translation(
-            group=obj,
-        )
-        return translation.title
+    def get_title(self, obj: UnitGroup) -> str | None:
+        return self.translation_resolver.get_unit_group_title(group=obj)
 
 
-class UnitSerializer(serializers.ModelSerializer):
+class UnitSerializer(UnitTranslationSerializerMixin, serializers.ModelSerializer):
     group = UnitGroupSerializer()
 
     title = serializers.SerializerMethodField()
@@ -37,10 +42,10 @@ class UnitSerializer(serializers.ModelSerializer):
             'short_title',
         ]
 
-    def get_title(self, obj: Unit) -> str:
-        translation = UnitTranslationService.get_unit_translation(unit=obj)
-        return translation.title
+    def get_title(self, obj: Unit) -> str | None:
+        translation = self.translation_resolver.get_unit_translation(unit=obj)
+        return translation.title if translation else None
 
-    def get_short_title(self, obj: Unit) -> str:
-        translation = UnitTranslationService.get_unit_translation(unit=obj)
-        return translation.short_title
+    def get_short_title(self, obj: Unit) -> str | None:
+        translation = self.translation_resolver.get_unit_translation(unit=obj)
+        return translation.short_title if translation else None
@@ -1,26 +1,32 @@
 from django.db.models import QuerySet
 from rest_framework import mixins
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from api.v1.unit.serializers import UnitSerializer
+from api.common.views import ListResponseCacheMixin
+from api.v1.unit.serializers import UnitConversionItemSerializer, UnitConvertSerializer, UnitSerializer
 from apps.unit.models import Unit
 
 
 class UnitViewSet(
+    ListResponseCacheMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
     permission_classes = (IsAuthenticated,)
     serializer_class = UnitSerializer
+    # Справочник общий для всех пользователей, ключ кэша меняется с версией каталога ед. измерений
+    response_cache_per_owner = False
 
     def get_queryset(self) -> QuerySet[Unit]:
-        queryset = (
-            Unit.objects.select_related('group')
-            .prefetch_related(
-                'translations',
-                'group__translations',
-            )
-            .all()
-        )
-        return queryset
+        return Unit.objects.select_related('group').all()
+
+    @action(detail=False, methods=['post'], serializer_class=UnitConvertSerializer)
+    def convert(self, request: Request) -> Response:
+        """Пакетный перевод количеств между ед. измерений одной группы."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(UnitConversionItemSerializer(serializer.validated_data['items'], many=True).data)
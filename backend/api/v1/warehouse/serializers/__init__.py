@@ -1,25 +1,53 @@
 from .categories import CategoryCreateSerializer, CategoryResponseSerializer
-from .material import MaterialCreateSerializer, MaterialResponseSerializer, MaterialUpdateSerializer
-from .product import ProductCreateSerializer, ProductUpdateSerializer, ProductDetailSerializer, ProductListSerializer
+from .material import (
+    MaterialCreateSerializer,
+    MaterialResponseSerializer,
+    MaterialUpdateSerializer,
+    MaterialImportSerializer,
+    MaterialImportResultSerializer,
+)
+from .product import (
+    ProductCreateSerializer,
+    ProductUpdateSerializer,
+    ProductDetailSerializer,
+    ProductListSerializer,
+    ProductFlatListSerializer,
+)
 from .product_component import (
     ProductComponentCreateSerializer,
     ProductComponentUpdateSerializer,
     ProductComponentResponseSerializer,
 )
 from .resource import ResourceResponseSerializer, ResourceCreateSerializer, ResourceUpdateSerializer
-from .warehouse import WarehouseResponseModelSerializer, WarehouseCreateModelSerializer, WarehouseUpdateModelSerializer
+from .warehouse import (
+    WarehouseResponseModelSerializer,
+    WarehouseCreateModelSerializer,
+    WarehouseUpdateModelSerializer,
+    WarehouseExportSerializer,
+    LowStockItemSerializer,
+    ProductCostSerializer,
+    ProductCapacitySerializer,
+)
 from .file_attachment import FileAttachmentSerializer
+from .stock_movement import ProductionSerializer, StockAdjustmentSerializer, StockMovementResponseSerializer
+from .where_used import WhereUsedBatchSerializer, WhereUsedItemSerializer
 
 __all__ = [
     'WarehouseResponseModelSerializer',
     'WarehouseCreateModelSerializer',
     'WarehouseUpdateModelSerializer',
+    'WarehouseExportSerializer',
+    'LowStockItemSerializer',
+    'ProductCostSerializer',
+    'ProductCapacitySerializer',
     'FileAttachmentSerializer',
     'CategoryCreateSerializer',
     'CategoryResponseSerializer',
     'MaterialCreateSerializer',
     'MaterialUpdateSerializer',
     'MaterialResponseSerializer',
+    'MaterialImportSerializer',
+    'MaterialImportResultSerializer',
     'ResourceResponseSerializer',
     'ResourceCreateSerializer',
     'ResourceUpdateSerializer',
@@ -30,4 +58,10 @@ __all__ = [
     'ProductUpdateSerializer',
     'ProductDetailSerializer',
     'ProductListSerializer',
+    'ProductFlatListSerializer',
+    'ProductionSerializer',
+    'StockAdjustmentSerializer',
+    'StockMovementResponseSerializer',
+    'WhereUsedBatchSerializer',
+    'WhereUsedItemSerializer',
 ]
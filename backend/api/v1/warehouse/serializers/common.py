@@ -1,12 +1,29 @@
+from django.db.models import F
 from rest_framework import serializers
 
-from api.common.serializers import BaseSerializer
+from api.common.serializers import (
+    BaseSerializer,
+    FlatListSerializer,
+    SparseFieldsetSerializerMixin,
+    decimal_to_representation,
+)
+from api.v1.unit.serializers.unit import UnitTranslationSerializerMixin
 from apps.unit.models import Unit
-from apps.unit.services import UnitTranslationService
+from apps.unit.services import UnitTranslationResolver
 from apps.warehouse.models import Category, FileAttachment
 from apps.warehouse.models.abs_storage_entity import StorageEntity
 
 
+def unit_to_representation(unit_id: int, context: dict) -> dict:
+    """Ед. измерений по id из каталога, вывод совпадает с WarehouseUnitSerializer."""
+    translation = UnitTranslationResolver.from_context(context).get_unit_translation_by_id(unit_id)
+    return {
+        'id': unit_id,
+        'title': translation.title if translation else None,
+        'short_title': translation.short_title if translation else None,
+    }
+
+
 class WarehouseAttachmentsModelsSerializer(serializers.ModelSerializer):
     file_name = serializers.SerializerMethodField(read_only=True)
 
@@ -21,7 +38,7 @@ class WarehouseAttachmentsModelsSerializer(serializers.ModelSerializer):
         return obj.file.name.split('/')[-1] if obj.file.name else None
 
 
-class WarehouseUnitSerializer(serializers.ModelSerializer):
+class WarehouseUnitSerializer(UnitTranslationSerializerMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     short_title = serializers.SerializerMethodField()
 
@@ -33,13 +50,13 @@ class WarehouseUnitSerializer(serializers.ModelSerializer):
             'short_title',
         ]
 
-    def get_title(self, obj: Unit) -> str:
-        translation = UnitTranslationService.get_unit_translation(unit=obj)
-        return translation.title
+    def get_title(self, obj: Unit) -> str | None:
+        translation = self.translation_resolver.get_unit_translation(unit=obj)
+        return translation.title if translation else None
 
-    def get_short_title(self, obj: Unit) -> str:
-        translation = UnitTranslationService.get_unit_translation(unit=obj)
-        return translation.short_title
+    def get_short_title(self, obj: Unit) -> str | None:
+        translation = self.translation_resolver.get_unit_translation(unit=obj)
+        return translation.short_title if translation else None
 
 
 class WareHouseCategoriesSerializer(serializers.ModelSerializer):
@@ -68,7 +85,7 @@ class StorageEntityRequestSerializer(BaseSerializer):
         ]
 
 
-class StorageEntityResponseSerializer(BaseSerializer):
+class StorageEntityResponseSerializer(SparseFieldsetSerializerMixin, BaseSerializer):
     unit = WarehouseUnitSerializer(read_only=True)
     categories = WareHouseCategoriesSerializer(many=True, required=False)
 
@@ -85,3 +102,45 @@ class StorageEntityResponseSerializer(BaseSerializer):
             'sku',
         ]
         read_only_fields = fields
+
+
+class StorageEntityFlatListSerializer(FlatListSerializer):
+    """Плоский сериализатор списка складских сущностей, вывод совпадает с StorageEntityResponseSerializer."""
+
+    model: type[StorageEntity]
+    values_fields = (
+        'id',
+        'created_at',
+        'unit_id',
+        'title',
+        'price',
+        'notes',
+        'remaining',
+        'min_remaining',
+        'sku',
+    )
+
+    def load_related(self, rows: list[dict]) -> dict:
+        related_query_name = self.model._meta.get_field('categories').related_query_name()
+        categories: dict[int, list[dict]] = {row['id']: [] for row in rows}
+        for category in Category.objects.filter(**{f'{related_query_name}__in': list(categories)}).values(
+            'id', 'title', 'category_type', entity_id=F(related_query_name)
+        ):
+            entity_id = category.pop('entity_id')
+            categories[entity_id].append(category)
+        return {'categories': categories}
+
+    def to_row_representation(self, row: dict, related: dict) -> dict:
+        return {
+            'categories': related['categories'][row['id']],
+            'unit': self.get_unit(row['unit_id']),
+            'title': row['title'],
+            'price': decimal_to_representation(row['price'], 2),
+            'notes': row['notes'],
+            'remaining': decimal_to_representation(row['remaining'], 4),
+            'min_remaining': decimal_to_representation(row['min_remaining'], 4),
+            'sku': row['sku'],
+        }
+
+    def get_unit(self, unit_id: int) -> dict:
+        return unit_to_representation(unit_id, self.context)
@@ -5,6 +5,7 @@ from api.v1.warehouse.serializers.common import (
     StorageEntityResponseSerializer,
     WarehouseAttachmentsModelsSerializer,
 )
+from apps.warehouse.choices import ExportFormatChoices
 from apps.warehouse.models import Material, Warehouse
 
 
@@ -31,6 +32,8 @@ class MaterialUpdateSerializer(StorageEntityRequestSerializer):
         fields = [
             'id',
         ] + StorageEntityRequestSerializer.Meta.fields
+        # Остаток меняется только через журнал движений остатков
+        read_only_fields = ['remaining']
 
 
 class MaterialResponseSerializer(StorageEntityResponseSerializer):
@@ -44,3 +47,15 @@ class MaterialResponseSerializer(StorageEntityResponseSerializer):
             'warehouse',
             'attachments',
         ] + StorageEntityResponseSerializer.Meta.fields
+
+
+class MaterialImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=ExportFormatChoices.choices,
+        default=ExportFormatChoices.NDJSON,
+    )
+
+
+class MaterialImportResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
@@ -1,11 +1,13 @@
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from api.v1.warehouse.serializers.common import (
+    StorageEntityFlatListSerializer,
     StorageEntityRequestSerializer,
     StorageEntityResponseSerializer,
     WarehouseAttachmentsModelsSerializer,
 )
-from apps.warehouse.models import Product
+from apps.warehouse.models import Product, ProductComponent
 
 from .product_component import (
     ProductComponentCreateSerializer,
@@ -38,6 +40,8 @@ class ProductUpdateSerializer(StorageEntityRequestSerializer):
             'id',
             'components',
         ] + StorageEntityRequestSerializer.Meta.fields
+        # Остаток меняется только через журнал движений остатков и производство
+        read_only_fields = ['remaining']
 
 
 class ProductDetailSerializer(StorageEntityResponseSerializer):
@@ -53,6 +57,15 @@ class ProductDetailSerializer(StorageEntityResponseSerializer):
             'components',
         ] + StorageEntityResponseSerializer.Meta.fields
 
+    def to_representation(self, instance: Product) -> dict:
+        if isinstance(self.fields.get('components'), serializers.ListSerializer):
+            # Компоненты вместе с материалами и ресурсами: один запрос на состав и по одному на тип объекта
+            prefetch_related_objects(
+                [instance],
+                Prefetch('components', queryset=ProductComponent.objects.select_related('unit').with_component()),
+            )
+        return super().to_representation(instance)
+
 
 class ProductListSerializer(StorageEntityResponseSerializer):
     class Meta:
@@ -61,3 +74,17 @@ class ProductListSerializer(StorageEntityResponseSerializer):
             'id',
             'warehouse',
         ] + StorageEntityResponseSerializer.Meta.fields
+
+
+class ProductFlatListSerializer(StorageEntityFlatListSerializer):
+    """Плоский сериализатор списка продуктов, вывод совпадает с ProductListSerializer."""
+
+    model = Product
+    values_fields = StorageEntityFlatListSerializer.values_fields + ('warehouse_id',)
+
+    def to_row_representation(self, row: dict, related: dict) -> dict:
+        return {
+            'id': row['id'],
+            'warehouse': row['warehouse_id'],
+            **super().to_row_representation(row, related),
+        }
@@ -1,6 +1,8 @@
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
-from api.v1.warehouse.serializers.common import WarehouseUnitSerializer
+from api.common.serializers import decimal_to_representation
+from api.v1.warehouse.serializers.common import WarehouseUnitSerializer, unit_to_representation
 from apps.warehouse.choices import ProductComponentChoices
 from apps.warehouse.models import Material, ProductComponent, Resource
 
@@ -43,10 +45,28 @@ class ProductComponentUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
+class ProductComponentObjectSerializer(serializers.Serializer):
+    """Материал или ресурс компонента."""
+
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    unit = serializers.SerializerMethodField()
+    price = serializers.SerializerMethodField()
+
+    def get_unit(self, obj: Material | Resource) -> dict:
+        return unit_to_representation(obj.unit_id, self.context)
+
+    def get_price(self, obj: Material | Resource) -> str | None:
+        price = obj.get_unit_price() if isinstance(obj, Resource) else obj.price
+        return decimal_to_representation(price, 2)
+
+
 class ProductComponentResponseSerializer(serializers.ModelSerializer):
     unit = WarehouseUnitSerializer(read_only=True)
 
     content_type = serializers.SerializerMethodField()
+    # Загружается пакетно через ProductComponent.objects.with_component()
+    component = ProductComponentObjectSerializer(read_only=True)
 
     class Meta:
         model = ProductComponent
@@ -57,10 +77,12 @@ class ProductComponentResponseSerializer(serializers.ModelSerializer):
             'quantity',
             'content_type',
             'object_id',
+            'component',
         ]
 
     def get_content_type(self, obj: ProductComponent) -> str:
-        model_class = obj.content_type.model_class()
+        # get_for_id читает кэш ContentType, а не запрашивает связь для каждой строки
+        model_class = ContentType.objects.get_for_id(obj.content_type_id).model_class()
         if model_class.__name__ == Material.__name__:
             return ProductComponentChoices.MATERIAL
         if model_class.__name__ == Resource.__name__:
@@ -1,4 +1,4 @@
-from api.common.serializers import BaseSerializer
+from api.common.serializers import BaseSerializer, SparseFieldsetSerializerMixin
 from api.v1.warehouse.serializers.common import (
     WarehouseAttachmentsModelsSerializer,
     WareHouseCategoriesSerializer,
@@ -7,7 +7,7 @@ from api.v1.warehouse.serializers.common import (
 from apps.warehouse.models import Resource
 
 
-class ResourceResponseSerializer(BaseSerializer):
+class ResourceResponseSerializer(SparseFieldsetSerializerMixin, BaseSerializer):
     attachments = WarehouseAttachmentsModelsSerializer(
         many=True,
         required=False,
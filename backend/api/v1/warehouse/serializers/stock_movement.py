@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.warehouse.choices import StockMovementReasonChoices
+from apps.warehouse.models import StockMovement
+
+
+class StockAdjustmentItemSerializer(serializers.Serializer):
+    entity_id = serializers.IntegerField(min_value=1)
+    delta = serializers.DecimalField(max_digits=12, decimal_places=4)
+    # Движения производства создаются только сервисом производства
+    reason = serializers.ChoiceField(
+        choices=[
+            StockMovementReasonChoices.RECEIPT,
+            StockMovementReasonChoices.WRITE_OFF,
+            StockMovementReasonChoices.ADJUSTMENT,
+        ],
+        default=StockMovementReasonChoices.ADJUSTMENT,
+    )
+    comment = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+
+    def validate_delta(self, value: Decimal) -> Decimal:
+        if value == 0:
+            raise serializers.ValidationError(_('Изменение остатка не может быть нулевым'))
+        return value
+
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    adjustments = serializers.ListField(
+        child=StockAdjustmentItemSerializer(),
+        min_length=1,
+        max_length=settings.STOCK_ADJUSTMENT_MAX_ITEMS,
+    )
+
+
+class ProductionSerializer(serializers.Serializer):
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=4, min_value=Decimal('0.0001'))
+    comment = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+
+
+class StockMovementResponseSerializer(serializers.ModelSerializer):
+    entity_id = serializers.IntegerField(source='object_id', read_only=True)
+
+    class Meta:
+        model = StockMovement
+        fields = [
+            'id',
+            'warehouse',
+            'entity_id',
+            'delta',
+            'remaining',
+            'reason',
+            'comment',
+            'created_by',
+            'created_at',
+        ]
+        read_only_fields = fields
@@ -3,7 +3,7 @@ from rest_framework import serializers
 
 from api.common.serializers import BaseSerializer
 from api.v1.warehouse.serializers.common import WarehouseAttachmentsModelsSerializer, WareHouseCategoriesSerializer
-from apps.warehouse.choices import StorageTypeChoices
+from apps.warehouse.choices import ExportFormatChoices, StorageTypeChoices
 from apps.warehouse.models import Material, Product, Warehouse
 
 
@@ -30,14 +30,22 @@ class WarehouseResponseModelSerializer(BaseSerializer):
 
     def get_materials_count(self, obj: Warehouse) -> str:
         if obj.storage_type == StorageTypeChoices.MATERIAL:
-            return Material.objects.filter(warehouse_id=obj.id).count()
+            return self._get_count(obj, 'materials_count', Material)
         return '-'
 
     def get_products_count(self, obj: Warehouse) -> str:
         if obj.storage_type == StorageTypeChoices.PRODUCT:
-            return Product.objects.filter(warehouse_id=obj.id).count()
+            return self._get_count(obj, 'products_count', Product)
         return '-'
 
+    @staticmethod
+    def _get_count(obj: Warehouse, annotation: str, model: type[Material | Product]) -> int:
+        """Берет количество из аннотации queryset, а для неаннотированного склада считает отдельно."""
+        count = getattr(obj, annotation, None)
+        if count is None:
+            count = model.objects.filter(warehouse_id=obj.id).count()
+        return count
+
     @extend_schema_field(
         {
             'type': 'object',
@@ -76,3 +84,33 @@ class WarehouseUpdateModelSerializer(BaseSerializer):
             'storage_type',
             'categories',
         ]
+
+
+class WarehouseExportSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(
+        choices=ExportFormatChoices.choices,
+        default=ExportFormatChoices.NDJSON,
+    )
+
+
+class LowStockItemSerializer(serializers.Serializer):
+    entity_type = serializers.ChoiceField(choices=StorageTypeChoices.choices)
+    id = serializers.IntegerField()
+    warehouse_id = serializers.IntegerField()
+    title = serializers.CharField()
+    remaining = serializers.DecimalField(max_digits=12, decimal_places=4)
+    min_remaining = serializers.DecimalField(max_digits=12, decimal_places=4)
+    shortage = serializers.DecimalField(max_digits=12, decimal_places=4)
+
+
+class ProductCostSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    cost = serializers.DecimalField(max_digits=16, decimal_places=2)
+    is_complete = serializers.BooleanField()
+
+
+class ProductCapacitySerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    capacity = serializers.IntegerField(allow_null=True)
+    limiting_component_id = serializers.IntegerField(allow_null=True)
+    limiting_material_id = serializers.IntegerField(allow_null=True)
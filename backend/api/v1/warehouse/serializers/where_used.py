@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class WhereUsedBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.WHERE_USED_MAX_ITEMS,
+    )
+
+
+class WhereUsedItemSerializer(serializers.Serializer):
+    object_id = serializers.IntegerField()
+    component_id = serializers.IntegerField()
+    product_id = serializers.IntegerField()
+    product_title = serializers.CharField()
+    warehouse_id = serializers.IntegerField()
+    # Количество в ед. измерений материала/ресурса
+    quantity = serializers.DecimalField(max_digits=16, decimal_places=4, allow_null=True)
+    unit_id = serializers.IntegerField()
+    component_quantity = serializers.DecimalField(max_digits=10, decimal_places=2)
+    component_unit_id = serializers.IntegerField()
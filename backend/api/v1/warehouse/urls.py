@@ -7,6 +7,7 @@ from api.v1.warehouse.views import (
     ProductComponentViewSet,
     ProductViewSet,
     ResourceViewSet,
+    StockMovementViewSet,
     WarehouseViewSet,
 )
 
@@ -20,6 +21,7 @@ router.register('resources', ResourceViewSet, basename='resources')
 router.register('products/(?P<product_id>[^/.]+)/components', ProductComponentViewSet, basename='components')
 router.register('(?P<warehouse_id>[^/.]+)/products', ProductViewSet, basename='products')
 router.register('(?P<warehouse_id>[^/.]+)/materials', MaterialViewSet, basename='materials')
+router.register('(?P<warehouse_id>[^/.]+)/stock-movements', StockMovementViewSet, basename='stock-movements')
 router.register('', WarehouseViewSet, basename='warehouse-crud')
 
 urlpatterns = router.urls
@@ -4,6 +4,7 @@ from .material import MaterialViewSet
 from .product_component import ProductComponentViewSet
 from .product import ProductViewSet
 from .resource import ResourceViewSet
+from .stock_movement import StockMovementViewSet
 from .warehouse import WarehouseViewSet
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     'ResourceViewSet',
     'ProductComponentViewSet',
     'ProductViewSet',
+    'StockMovementViewSet',
 ]
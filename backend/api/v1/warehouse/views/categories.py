@@ -1,18 +1,20 @@
 from django.db.models import QuerySet
 from rest_framework.permissions import IsAuthenticated
 
+from api.common.filters import OwnerFilterBackend
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
-from api.common.views import BaseModelViewSet
+from api.common.views import BaseModelViewSet, KeysetPaginationMixin
 from api.v1.warehouse.serializers import CategoryCreateSerializer, CategoryResponseSerializer
 from api.v1.warehouse.serializers.categories import CategoryUpdateSerializer
 from apps.warehouse.models import Category
 
 
-class CategoryViewSet(BaseModelViewSet):
+class CategoryViewSet(KeysetPaginationMixin, BaseModelViewSet):
     """ViewSet CRUD категорий."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    filter_backends = [OwnerFilterBackend]
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=CategoryResponseSerializer,
@@ -33,7 +35,7 @@ class CategoryViewSet(BaseModelViewSet):
     )
 
     def get_queryset(self) -> QuerySet[Category]:
-        return Category.objects.select_related('user').filter(user=self.request.user)
+        return Category.objects.select_related('user')
 
     def perform_create(self, serializer: CategoryCreateSerializer) -> Category:
         data = serializer.validated_data
@@ -1,16 +1,18 @@
-import mimetypes
 import os
 from typing import Any
 
+from django.conf import settings
 from django.db.models import QuerySet
-from django.http import FileResponse
+from django.http import HttpRequest, HttpResponseBase
 from rest_framework import serializers, status
 from rest_framework.mixins import CreateModelMixin, DestroyModelMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from api.common.downloads import FileDownload
 from api.common.permissions import HasUserObjPerms
+from api.common.uploads import MaxSizeUploadHandler
 from api.common.views import BaseGenericViewSet
 from api.v1.warehouse.serializers import FileAttachmentSerializer
 from apps.warehouse.models import FileAttachment
@@ -29,6 +31,11 @@ class FileAttachmentViewSet(
     def get_queryset(self) -> QuerySet:
         return FileAttachment.objects.all()
 
+    def initialize_request(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Request:
+        # Лимит размера проверяется при чтении тела запроса, проверка в сервисе остается страховкой
+        request.upload_handlers.insert(0, MaxSizeUploadHandler(request, max_size=settings.FILE_ATTACHMENT_MAX_SIZE))
+        return super().initialize_request(request, *args, **kwargs)
+
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -45,26 +52,17 @@ class FileAttachmentViewSet(
         file_attachment = serializer.validated_data['file']
         service = FileAttachmentCreateService(
             filename=file_attachment.name,
-            file=file_attachment.read(),
+            file=file_attachment,
+            user_id=self.request.user.id,
         )
         return service.create(
             content_type_str=serializer.validated_data['content_type'],
             object_id=serializer.validated_data['object_id'],
         )
 
-    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> FileResponse:
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
         instance = self.get_object()
-        file_path = instance.file.path
-        if not os.path.exists(file_path):
+        if not os.path.exists(instance.file.path):
             raise serializers.ValidationError({'id': 'Файл не найден'})
-        file_handle = open(file_path, 'rb')
-
-        mime_type, _ = mimetypes.guess_type(file_path)
-        if mime_type is None:
-            mime_type = 'application/octet-stream'
 
-        response = FileResponse(file_handle, content_type=mime_type)
-        file_name = os.path.basename(file_path)
-        response['Content-Disposition'] = f'attachment; filename="{file_name}"'
-        response['Content-Length'] = instance.file.size
-        return response
+        return FileDownload(request=request, file=instance.file).response()
@@ -1,21 +1,41 @@
 from functools import cached_property
 
 from django.db.models import QuerySet
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from api.common.enums import SerializerType
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
-from api.common.views import BaseModelViewSet
-from api.v1.warehouse.serializers import MaterialCreateSerializer, MaterialResponseSerializer, MaterialUpdateSerializer
+from api.common.views import BaseModelViewSet, KeysetPaginationMixin, ParentOwnerViewSetMixin
+from api.v1.warehouse.serializers import (
+    MaterialCreateSerializer,
+    MaterialImportResultSerializer,
+    MaterialImportSerializer,
+    MaterialResponseSerializer,
+    MaterialUpdateSerializer,
+    WhereUsedBatchSerializer,
+    WhereUsedItemSerializer,
+)
+from api.v1.warehouse.views.where_used import WhereUsedViewSetMixin
 from apps.warehouse.models import Material, Warehouse
 from apps.warehouse.services.material.service import MaterialService
+from apps.warehouse.services.material_import import MaterialImportService
 
 
-class MaterialViewSet(BaseModelViewSet):
+class MaterialViewSet(WhereUsedViewSetMixin, ParentOwnerViewSetMixin, KeysetPaginationMixin, BaseModelViewSet):
     """ViewSet CRUD материалов."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    parent_model = Warehouse
+    parent_url_kwarg = 'warehouse_id'
+    parent_lookup = 'warehouse_id'
+    where_used_select_related = ('warehouse',)
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=MaterialResponseSerializer,
@@ -33,6 +53,19 @@ class MaterialViewSet(BaseModelViewSet):
             response=MaterialResponseSerializer,
             request=MaterialUpdateSerializer,
         ),
+        actions={
+            'import_materials': SerializerTypeMapping(
+                response=MaterialImportResultSerializer,
+                request=MaterialImportSerializer,
+            ),
+            'where_used': SerializerTypeMapping(
+                response=WhereUsedItemSerializer,
+            ),
+            'where_used_batch': SerializerTypeMapping(
+                response=WhereUsedItemSerializer,
+                request=WhereUsedBatchSerializer,
+            ),
+        },
     )
 
     @cached_property
@@ -43,19 +76,28 @@ class MaterialViewSet(BaseModelViewSet):
         return warehouse
 
     def get_queryset(self) -> QuerySet[Material]:
-        return (
-            Material.objects.select_related(
-                'warehouse',
-                'unit',
-            )
-            .prefetch_related(
-                'attachments',
-                'categories',
-                'unit__translations',
-            )
-            .filter(warehouse=self.warehouse)
+        return self.select_response_related(
+            Material.objects.all(),
+            select_related=('warehouse', 'unit'),
+            prefetch_related=('attachments', 'categories'),
         )
 
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_materials(self, request: Request, warehouse_id: int | None = None) -> Response:
+        """Пакетный импорт материалов склада из CSV/NDJSON."""
+        serializer = self.get_serializer(data=request.data, type_=SerializerType.REQUEST)
+        serializer.is_valid(raise_exception=True)
+
+        service = MaterialImportService(
+            warehouse=self.warehouse,
+            file=serializer.validated_data['file'],
+            file_format=serializer.validated_data['file_format'],
+        )
+        materials = service.run()
+
+        serializer = self.get_serializer(instance={'created': len(materials)}, type_=SerializerType.RESPONSE)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def perform_create(self, serializer: MaterialCreateSerializer) -> Material:
         validated_data = serializer.validated_data
         service = MaterialService(
@@ -77,13 +119,12 @@ class MaterialViewSet(BaseModelViewSet):
         instance = serializer.instance
 
         service = MaterialService(
-            warehouse=self.warehouse,
+            warehouse=instance.warehouse,
             unit=validated_data['unit'],
             title=validated_data['title'],
             sku=validated_data['sku'],
             notes=validated_data['notes'],
             price=validated_data['price'],
-            remaining=validated_data['remaining'],
             min_remaining=validated_data['min_remaining'],
             categories_id=[category.id for category in validated_data.get('categories', [])],
         )
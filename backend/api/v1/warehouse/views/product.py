@@ -1,27 +1,40 @@
 from functools import cached_property
 
 from django.db.models import QuerySet
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from api.common.enums import SerializerType
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
-from api.common.views import BaseModelViewSet
+from api.common.views import BaseModelViewSet, KeysetPaginationMixin, ParentOwnerViewSetMixin
 from api.v1.warehouse.serializers import (
     ProductCreateSerializer,
     ProductDetailSerializer,
+    ProductFlatListSerializer,
+    ProductionSerializer,
     ProductListSerializer,
     ProductUpdateSerializer,
+    StockMovementResponseSerializer,
 )
 from apps.warehouse.models import Product, Warehouse
 from apps.warehouse.services.dto import ProductComponentDTO
 from apps.warehouse.services.product import ProductCreateService, ProductUpdateService
+from apps.warehouse.services.production import ProductionService
 
 
-class ProductViewSet(BaseModelViewSet):
+class ProductViewSet(ParentOwnerViewSetMixin, KeysetPaginationMixin, BaseModelViewSet):
     """ViewSet CRUD продуктов."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    flat_list_serializer_class = ProductFlatListSerializer
+    parent_model = Warehouse
+    parent_url_kwarg = 'warehouse_id'
+    parent_lookup = 'warehouse_id'
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=ProductListSerializer,
@@ -39,6 +52,12 @@ class ProductViewSet(BaseModelViewSet):
             response=ProductDetailSerializer,
             request=ProductUpdateSerializer,
         ),
+        actions={
+            'produce': SerializerTypeMapping(
+                response=StockMovementResponseSerializer,
+                request=ProductionSerializer,
+            ),
+        },
     )
 
     @cached_property
@@ -49,18 +68,28 @@ class ProductViewSet(BaseModelViewSet):
         return warehouse
 
     def get_queryset(self) -> QuerySet[Product]:
-        return (
-            Product.objects.select_related(
-                'warehouse',
-                'unit',
-            )
-            .prefetch_related(
-                'attachments',
-                'categories',
-                'unit__translations',
-            )
-            .filter(warehouse=self.warehouse)
+        return self.select_response_related(
+            Product.objects.all(),
+            select_related=('warehouse', 'unit'),
+            prefetch_related=('attachments', 'categories'),
+        )
+
+    @action(detail=True, methods=['post'])
+    def produce(self, request: Request, warehouse_id: int | None = None, pk: int | None = None) -> Response:
+        """Производство партии продукта со списанием материалов состава."""
+        serializer = self.get_serializer(data=request.data, type_=SerializerType.REQUEST)
+        serializer.is_valid(raise_exception=True)
+
+        service = ProductionService(
+            product=self.get_object(),
+            quantity=serializer.validated_data['quantity'],
+            user=request.user,
+            comment=serializer.validated_data['comment'],
         )
+        movements = service.produce()
+
+        serializer = self.get_serializer(instance=movements, many=True, type_=SerializerType.RESPONSE)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer: ProductCreateSerializer) -> Product:
         validated_data = serializer.validated_data
@@ -84,13 +113,12 @@ class ProductViewSet(BaseModelViewSet):
         instance = serializer.instance
 
         service = ProductUpdateService(
-            warehouse=self.warehouse,
+            warehouse=instance.warehouse,
             unit=validated_data['unit'],
             title=validated_data['title'],
             sku=validated_data['sku'],
             notes=validated_data['notes'],
             price=validated_data['price'],
-            remaining=validated_data['remaining'],
             min_remaining=validated_data['min_remaining'],
             categories_id=[category.id for category in validated_data.get('categories', [])],
             components=self._get_components(validated_data),
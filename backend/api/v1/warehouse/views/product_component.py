@@ -6,7 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
-from api.common.views import BaseModelViewSet
+from api.common.views import BaseModelViewSet, ParentOwnerViewSetMixin
 from api.v1.warehouse.serializers import (
     ProductComponentCreateSerializer,
     ProductComponentResponseSerializer,
@@ -16,10 +16,15 @@ from apps.warehouse.models import Product, ProductComponent
 from apps.warehouse.services.product_component import ProductComponentCreateService, ProductComponentUpdateService
 
 
-class ProductComponentViewSet(BaseModelViewSet):
+class ProductComponentViewSet(ParentOwnerViewSetMixin, BaseModelViewSet):
     """ViewSet CRUD компонентов продукта."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    parent_model = Product
+    parent_url_kwarg = 'product_id'
+    parent_lookup = 'product_id'
+    # У компонентов нет времени изменения, состояние выборки в ETag - количество строк
+    conditional_get_updated_field = None
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=ProductComponentResponseSerializer,
@@ -47,18 +52,13 @@ class ProductComponentViewSet(BaseModelViewSet):
         return product
 
     def get_queryset(self) -> QuerySet[ProductComponent]:
-        return (
-            ProductComponent.objects.select_related(
-                'product',
-                'unit',
-                'unit__group',
-                'content_type',
-            )
-            .prefetch_related(
-                'unit__translations',
-            )
-            .filter(product=self.product)
-        )
+        return ProductComponent.objects.select_related(
+            'product',
+            'product__warehouse',
+            'unit',
+            'unit__group',
+            'content_type',
+        ).with_component()
 
     def perform_create(self, serializer: ProductComponentCreateSerializer) -> ProductComponent:
         validated_data = serializer.validated_data
@@ -78,7 +78,7 @@ class ProductComponentViewSet(BaseModelViewSet):
 
         service = ProductComponentUpdateService(
             id=instance.id,
-            product=self.product,
+            product=instance.product,
             unit=validated_data.get('unit'),
             content_type=validated_data.get('content_type'),
             object_id=validated_data.get('object_id'),
@@ -1,22 +1,27 @@
 from django.db.models import QuerySet
 from rest_framework.permissions import IsAuthenticated
 
+from api.common.filters import OwnerFilterBackend
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
-from api.common.views import BaseModelViewSet
+from api.common.views import BaseModelViewSet, KeysetPaginationMixin
 from api.v1.warehouse.serializers import (
     ResourceCreateSerializer,
     ResourceResponseSerializer,
     ResourceUpdateSerializer,
+    WhereUsedBatchSerializer,
+    WhereUsedItemSerializer,
 )
+from api.v1.warehouse.views.where_used import WhereUsedViewSetMixin
 from apps.warehouse.models import Material, Resource
 from apps.warehouse.services.resource.service import ResourceService
 
 
-class ResourceViewSet(BaseModelViewSet):
+class ResourceViewSet(WhereUsedViewSetMixin, KeysetPaginationMixin, BaseModelViewSet):
     """ViewSet CRUD ресурсов."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    filter_backends = [OwnerFilterBackend]
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=ResourceResponseSerializer,
@@ -34,20 +39,22 @@ class ResourceViewSet(BaseModelViewSet):
             response=ResourceResponseSerializer,
             request=ResourceUpdateSerializer,
         ),
+        actions={
+            'where_used': SerializerTypeMapping(
+                response=WhereUsedItemSerializer,
+            ),
+            'where_used_batch': SerializerTypeMapping(
+                response=WhereUsedItemSerializer,
+                request=WhereUsedBatchSerializer,
+            ),
+        },
     )
 
     def get_queryset(self) -> QuerySet[Material]:
-        return (
-            Resource.objects.select_related(
-                'unit',
-                'user',
-            )
-            .prefetch_related(
-                'attachments',
-                'categories',
-                'unit__translations',
-            )
-            .filter(user=self.request.user)
+        return self.select_response_related(
+            Resource.objects.all(),
+            select_related=('unit', 'user'),
+            prefetch_related=('attachments', 'categories'),
         )
 
     def perform_create(self, serializer: ResourceCreateSerializer) -> Resource:
@@ -0,0 +1,78 @@
+from functools import cached_property
+from typing import Any
+
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers, status
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.common.enums import SerializerType
+from api.common.permissions import HasUserObjPerms
+from api.common.types import SerializerMapping, SerializerTypeMapping
+from api.common.views import BaseModelViewSet, KeysetPaginationMixin, ParentOwnerViewSetMixin
+from api.v1.warehouse.serializers import StockAdjustmentSerializer, StockMovementResponseSerializer
+from apps.warehouse.models import StockMovement, Warehouse
+from apps.warehouse.services.dto import StockAdjustmentDTO
+from apps.warehouse.services.stock import StockAdjustmentService
+
+
+class StockMovementViewSet(ParentOwnerViewSetMixin, KeysetPaginationMixin, BaseModelViewSet):
+    """Журнал движений остатков склада и пакетное изменение остатков.
+
+    Журнал только дополняется, поэтому изменение и удаление записей недоступны.
+    """
+
+    ENTITY_QUERY_PARAM = 'entity_id'
+
+    http_method_names = ['get', 'post', 'head', 'options']
+    permission_classes = [IsAuthenticated, HasUserObjPerms]
+    parent_model = Warehouse
+    parent_url_kwarg = 'warehouse_id'
+    parent_lookup = 'warehouse_id'
+    conditional_get_updated_field = 'created_at'
+    serializers = SerializerMapping(
+        list=SerializerTypeMapping(
+            response=StockMovementResponseSerializer,
+        ),
+        retrieve=SerializerTypeMapping(
+            response=StockMovementResponseSerializer,
+        ),
+        create=SerializerTypeMapping(
+            response=StockMovementResponseSerializer,
+            request=StockAdjustmentSerializer,
+        ),
+    )
+
+    @cached_property
+    def warehouse(self) -> Warehouse:
+        warehouse_id = self.kwargs.get('warehouse_id')
+        warehouse = get_object_or_404(Warehouse, pk=warehouse_id)
+        self.check_object_permissions(self.request, warehouse)
+        return warehouse
+
+    def get_queryset(self) -> QuerySet[StockMovement]:
+        queryset = StockMovement.objects.all()
+        entity_id = self.request.query_params.get(self.ENTITY_QUERY_PARAM)
+        if entity_id is not None:
+            if not entity_id.isdigit():
+                raise serializers.ValidationError({self.ENTITY_QUERY_PARAM: _('Некорректный id объекта склада')})
+            queryset = queryset.filter(object_id=entity_id)
+        return queryset
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Пакетное изменение остатков материалов/продуктов склада."""
+        serializer = self.get_serializer(data=request.data, type_=SerializerType.REQUEST)
+        serializer.is_valid(raise_exception=True)
+
+        service = StockAdjustmentService(
+            warehouse=self.warehouse,
+            adjustments=[StockAdjustmentDTO(**item) for item in serializer.validated_data['adjustments']],
+            user=request.user,
+        )
+        movements = service.apply()
+
+        serializer = self.get_serializer(instance=movements, many=True, type_=SerializerType.RESPONSE)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -1,16 +1,33 @@
-from django.db.models import QuerySet
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
+from api.common.enums import SerializerType
+from api.common.filters import OwnerFilterBackend
 from api.common.permissions import HasUserObjPerms
 from api.common.types import SerializerMapping, SerializerTypeMapping
 from api.common.views import BaseModelViewSet
 from api.v1.warehouse.serializers import (
+    LowStockItemSerializer,
+    ProductCapacitySerializer,
+    ProductCostSerializer,
     WarehouseCreateModelSerializer,
+    WarehouseExportSerializer,
     WarehouseResponseModelSerializer,
     WarehouseUpdateModelSerializer,
 )
-from apps.warehouse.models import Warehouse
+from apps.warehouse.models import Material, Product, Warehouse
+from apps.warehouse.services.export import WarehouseExportService
+from apps.warehouse.services.product_cost import ProductCostService
+from apps.warehouse.services.production import ProductCapacityService
+from apps.warehouse.services.stock import LowStockService
 from apps.warehouse.services.warehouse import WarehouseService
 
 
@@ -18,6 +35,7 @@ class WarehouseViewSet(BaseModelViewSet):
     """ViewSet CRUD склада."""
 
     permission_classes = [IsAuthenticated, HasUserObjPerms]
+    filter_backends = [OwnerFilterBackend]
     serializers = SerializerMapping(
         list=SerializerTypeMapping(
             response=WarehouseResponseModelSerializer,
@@ -35,15 +53,86 @@ class WarehouseViewSet(BaseModelViewSet):
             response=WarehouseResponseModelSerializer,
             request=WarehouseUpdateModelSerializer,
         ),
+        actions={
+            'export': SerializerTypeMapping(
+                response=WarehouseExportSerializer,
+                request=WarehouseExportSerializer,
+            ),
+            'low_stock': SerializerTypeMapping(
+                response=LowStockItemSerializer,
+            ),
+            'costs': SerializerTypeMapping(
+                response=ProductCostSerializer,
+            ),
+            'capacity': SerializerTypeMapping(
+                response=ProductCapacitySerializer,
+            ),
+        },
     )
 
     def get_queryset(self) -> QuerySet[Warehouse]:
         return (
             Warehouse.objects.select_related('user')
             .prefetch_related('categories', 'attachments')
-            .filter(user=self.request.user)
+            .annotate(
+                materials_count=self._count_subquery(Material),
+                products_count=self._count_subquery(Product),
+            )
         )
 
+    @staticmethod
+    def _count_subquery(model: type[Material | Product]) -> Coalesce:
+        """Количество объектов склада, вычисляемое в том же запросе, что и список складов."""
+        count = (
+            model.objects.filter(warehouse=OuterRef('pk'))
+            .order_by()
+            .values('warehouse')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return Coalesce(Subquery(count, output_field=IntegerField()), 0)
+
+    @extend_schema(
+        parameters=[WarehouseExportSerializer],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.BINARY, (200, 'text/csv'): OpenApiTypes.BINARY},
+    )
+    @action(detail=True, methods=['get'])
+    def export(self, request: Request, pk: int | None = None) -> StreamingHttpResponse:
+        """Потоковая выгрузка материалов или продуктов склада в CSV/NDJSON."""
+        serializer = self.get_serializer(data=request.query_params, type_=SerializerType.REQUEST)
+        serializer.is_valid(raise_exception=True)
+
+        service = WarehouseExportService(
+            warehouse=self.get_object(),
+            file_format=serializer.validated_data['file_format'],
+        )
+
+        response = StreamingHttpResponse(service.stream(), content_type=service.content_type)
+        response['Content-Disposition'] = f'attachment; filename="{service.file_name}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='low-stock')
+    def low_stock(self, request: Request) -> Response:
+        """Материалы и продукты всех складов пользователя с остатком ниже минимального."""
+        queryset = LowStockService(user_id=request.user.id).get_queryset()
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def costs(self, request: Request, pk: int | None = None) -> Response:
+        """Себестоимость всех продуктов склада по их составу."""
+        costs = ProductCostService(warehouse=self.get_object()).calculate()
+        serializer = self.get_serializer(costs, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def capacity(self, request: Request, pk: int | None = None) -> Response:
+        """Сколько единиц каждого продукта склада можно произвести из остатков материалов."""
+        capacities = ProductCapacityService(warehouse=self.get_object()).calculate()
+        serializer = self.get_serializer(capacities, many=True)
+        return Response(serializer.data)
+
     def perform_create(self, serializer: Serializer) -> Warehouse:
         validated_data = serializer.validated_data
 
@@ -0,0 +1,61 @@
+from typing import Any
+
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.common.enums import SerializerType
+from api.v1.warehouse.serializers import WhereUsedBatchSerializer
+from apps.warehouse.models import Material, Resource
+from apps.warehouse.services.where_used import WhereUsedService
+
+
+class WhereUsedViewSetMixin:
+    """Действия "где используется" для материалов и ресурсов.
+
+    Сериализаторы действий where_used и where_used_batch указываются в serializers ViewSet.
+    """
+
+    WHERE_USED_ACTIONS = ('where_used', 'where_used_batch')
+
+    # Связи, нужные для проверки прав на объект
+    where_used_select_related: tuple[str, ...] = ()
+
+    def get_queryset(self) -> QuerySet[Material | Resource]:
+        queryset = super().get_queryset()
+        if self.action in self.WHERE_USED_ACTIONS:
+            # Поля и связи ответа CRUD для поиска использований не нужны
+            return queryset.model.objects.select_related(*self.where_used_select_related)
+        return queryset
+
+    @action(detail=True, methods=['get'], url_path='where-used')
+    def where_used(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Продукты, в состав которых входит объект, с количеством в его ед. измерений."""
+        obj = self.get_object()
+        usages = WhereUsedService(model=type(obj), objects=[obj]).get_usages()
+        serializer = self.get_serializer(usages, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(parameters=[WhereUsedBatchSerializer])
+    @action(detail=False, methods=['get'], url_path='where-used', url_name='where-used-batch')
+    def where_used_batch(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Продукты, в состав которых входят объекты из списка ids."""
+        serializer = self.get_serializer(data=request.query_params, type_=SerializerType.REQUEST)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = list(queryset.filter(id__in=ids))
+        missing_ids = sorted(set(ids) - {obj.id for obj in objects})
+        if missing_ids:
+            raise serializers.ValidationError(
+                {'ids': _('Объекты не найдены: ') + ', '.join(str(object_id) for object_id in missing_ids)}
+            )
+
+        usages = WhereUsedService(model=queryset.model, objects=objects).get_usages()
+        serializer = self.get_serializer(usages, many=True)
+        return Response(serializer.data)
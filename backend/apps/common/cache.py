@@ -0,0 +1,58 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+
+__all__ = [
+    'OwnerCacheVersion',
+    'owner_cache_version',
+]
+
+
+class OwnerCacheVersion:
+    """Версия данных владельца в общем кэше.
+
+    Входит в ключи закэшированных ответов API, поэтому любое изменение данных пользователя
+    делает его закэшированные ответы недоступными без перебора ключей.
+
+    Новый счетчик начинается с текущего времени в наносекундах, а не с нуля: после перезапуска
+    кэша без сохранения данных или вытеснения ключа версии значения не повторяются, и ответы
+    и ETag, построенные по старой версии, не читаются снова.
+    """
+
+    KEY_TEMPLATE = 'owner:{owner_id}:version'
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.RESPONSE_CACHE_ALIAS]
+
+    def get(self, owner_id: int) -> int:
+        key = self.KEY_TEMPLATE.format(owner_id=owner_id)
+        version = self.cache.get(key)
+        if version is None:
+            version = time.time_ns()
+            if not self.cache.add(key, version, timeout=None):
+                # Счетчик параллельно создан другим воркером
+                version = self.cache.get(key, version)
+        return version
+
+    def bump(self, owner_id: int) -> None:
+        key = self.KEY_TEMPLATE.format(owner_id=owner_id)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, time.time_ns(), timeout=None):
+                self.cache.incr(key)
+
+    def bump_on_commit(self, owner_id: int | None) -> None:
+        """Повышает версию сразу и повторно после коммита транзакции."""
+        if owner_id is None:
+            return
+        self.bump(owner_id)
+        # Повторно после коммита: ответ мог быть закэширован до фиксации транзакции
+        transaction.on_commit(lambda: self.bump(owner_id))
+
+
+owner_cache_version = OwnerCacheVersion()
@@ -1,3 +1,45 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Unit, UnitGroup, UnitGroupTranslation, UnitTranslation
+
+
+class UnitTranslationInline(admin.TabularInline):
+    """Переводы ед. измерений."""
+
+    model = UnitTranslation
+    extra = 0
+
+
+class UnitGroupTranslationInline(admin.TabularInline):
+    """Переводы групп ед. измерений."""
+
+    model = UnitGroupTranslation
+    extra = 0
+
+
+class UnitAdmin(admin.ModelAdmin):
+    """Админка ед. измерений."""
+
+    list_display = [
+        'id',
+        'group',
+        'coefficient',
+    ]
+    list_filter = [
+        'group',
+    ]
+    inlines = [
+        UnitTranslationInline,
+    ]
+
+
+class UnitGroupAdmin(admin.ModelAdmin):
+    """Админка групп ед. измерений."""
+
+    inlines = [
+        UnitGroupTranslationInline,
+    ]
+
+
+admin.site.register(Unit, UnitAdmin)
+admin.site.register(UnitGroup, UnitGroupAdmin)
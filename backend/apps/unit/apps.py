@@ -5,3 +5,6 @@ class UnitConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.unit'
     label = 'unit'
+
+    def ready(self) -> None:
+        from apps.unit import signals  # noqa: F401
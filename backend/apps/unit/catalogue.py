@@ -0,0 +1,237 @@
+import dataclasses
+import threading
+import time
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+
+__all__ = [
+    'UnitCatalogue',
+    'UnitCatalogueSnapshot',
+    'UnitEntry',
+    'UnitGroupEntry',
+    'UnitTranslationEntry',
+    'unit_catalogue',
+]
+
+FALLBACK_LANGUAGE = 'en'
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UnitTranslationEntry:
+    """Перевод ед. измерений."""
+
+    title: str
+    short_title: str
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UnitEntry:
+    """Ед. измерений в каталоге."""
+
+    id: int
+    group_id: int
+    coefficient: Decimal
+    translations: Mapping[str, UnitTranslationEntry]
+
+    def get_translation(self, language: str) -> UnitTranslationEntry | None:
+        return self.translations.get(language) or self.translations.get(FALLBACK_LANGUAGE)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UnitGroupEntry:
+    """Группа ед. измерений в каталоге."""
+
+    id: int
+    titles: Mapping[str, str]
+    unit_ids: tuple[int, ...]
+
+    def get_title(self, language: str) -> str | None:
+        return self.titles.get(language) or self.titles.get(FALLBACK_LANGUAGE)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UnitCatalogueSnapshot:
+    """Неизменяемый снимок справочника ед. измерений."""
+
+    version: int
+    units: Mapping[int, UnitEntry]
+    groups: Mapping[int, UnitGroupEntry]
+    units_by_language: Mapping[str, Mapping[int, UnitTranslationEntry]]
+
+    def get_group_units(self, group_id: int) -> tuple[UnitEntry, ...]:
+        group = self.groups.get(group_id)
+        if group is None:
+            return ()
+        return tuple(self.units[unit_id] for unit_id in group.unit_ids)
+
+
+class UnitCatalogue:
+    """Каталог ед. измерений уровня процесса.
+
+    Справочник загружается один раз на воркер и перезагружается, когда меняется
+    версия в общем кэше. Версия проверяется не чаще чем раз в
+    UNIT_CATALOGUE_VERSION_CHECK_INTERVAL секунд.
+
+    Промах по id проверяет версию сразу, но каталог перезагружается только если версия сменилась.
+    Отсутствующие id запоминаются до смены снимка, поэтому повторные запросы несуществующих
+    ед. измерений не обращаются ни к БД, ни к общему кэшу.
+    """
+
+    VERSION_CACHE_KEY = 'unit:catalogue:version'
+
+    def __init__(self) -> None:
+        self._snapshot: UnitCatalogueSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Ключи ('unit'|'group', id), не найденные в текущем снимке
+        self._missing: set[tuple[str, int]] = set()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.UNIT_CATALOGUE_CACHE_ALIAS]
+
+    @property
+    def snapshot(self) -> UnitCatalogueSnapshot:
+        snapshot = self._snapshot
+        is_fresh = time.monotonic() - self._checked_at < settings.UNIT_CATALOGUE_VERSION_CHECK_INTERVAL
+        if snapshot is not None and is_fresh:
+            return snapshot
+
+        with self._lock:
+            return self._refresh()
+
+    def get_unit(self, unit_id: int) -> UnitEntry | None:
+        unit = self.snapshot.units.get(unit_id)
+        if unit is None and ('unit', unit_id) not in self._missing:
+            # Ед. измерений могла появиться после загрузки каталога
+            unit = self.refresh().units.get(unit_id)
+            if unit is None:
+                self._missing.add(('unit', unit_id))
+        return unit
+
+    def get_group(self, group_id: int) -> UnitGroupEntry | None:
+        group = self.snapshot.groups.get(group_id)
+        if group is None and ('group', group_id) not in self._missing:
+            group = self.refresh().groups.get(group_id)
+            if group is None:
+                self._missing.add(('group', group_id))
+        return group
+
+    def get_version(self) -> int:
+        return self.cache.get(self.VERSION_CACHE_KEY, 0)
+
+    def refresh(self) -> UnitCatalogueSnapshot:
+        """Проверяет версию без учета интервала и перезагружает каталог, только если она сменилась."""
+        with self._lock:
+            return self._refresh()
+
+    def reload(self) -> UnitCatalogueSnapshot:
+        with self._lock:
+            self._set_snapshot(self._load(self.get_version()))
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Повышает версию каталога во всех воркерах и сбрасывает локальный снимок."""
+        # Под блокировкой: параллельная перезагрузка не вернет устаревший снимок после сброса
+        with self._lock:
+            try:
+                self.cache.incr(self.VERSION_CACHE_KEY)
+            except ValueError:
+                if not self.cache.add(self.VERSION_CACHE_KEY, 1, timeout=None):
+                    self.cache.incr(self.VERSION_CACHE_KEY)
+            self._drop_snapshot()
+
+    def invalidate_on_commit(self) -> None:
+        """Сбрасывает каталог сразу и повторно после коммита транзакции.
+
+        Версия в общем кэше повышается один раз на транзакцию: при построчной загрузке справочника
+        следующие изменения только сбрасывают локальный снимок, чтобы транзакция читала свои данные.
+        """
+        connection = transaction.get_connection()
+        if connection.in_atomic_block and any(
+            func == self.invalidate for _savepoint_ids, func, _robust in connection.run_on_commit
+        ):
+            with self._lock:
+                self._drop_snapshot()
+            return
+        self.invalidate()
+        # Повторно после коммита: другие воркеры могли перечитать каталог до фиксации транзакции
+        transaction.on_commit(self.invalidate)
+
+    def _drop_snapshot(self) -> None:
+        self._snapshot = None
+        self._missing = set()
+
+    def _refresh(self) -> UnitCatalogueSnapshot:
+        version = self.get_version()
+        if self._snapshot is None or self._snapshot.version != version:
+            self._set_snapshot(self._load(version))
+        else:
+            self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def _set_snapshot(self, snapshot: UnitCatalogueSnapshot) -> None:
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        self._missing = set()
+
+    @staticmethod
+    def _load(version: int) -> UnitCatalogueSnapshot:
+        from apps.unit.models import Unit, UnitGroup, UnitGroupTranslation, UnitTranslation
+
+        unit_translations: dict[int, dict[str, UnitTranslationEntry]] = {}
+        units_by_language: dict[str, dict[int, UnitTranslationEntry]] = {}
+        for unit_id, language_code, title, short_title in UnitTranslation.objects.values_list(
+            'unit_id', 'language_code', 'title', 'short_title'
+        ):
+            entry = UnitTranslationEntry(title=title, short_title=short_title)
+            unit_translations.setdefault(unit_id, {})[language_code] = entry
+            units_by_language.setdefault(language_code, {})[unit_id] = entry
+
+        group_titles: dict[int, dict[str, str]] = {}
+        for group_id, language_code, title in UnitGroupTranslation.objects.values_list(
+            'group_id', 'language_code', 'title'
+        ):
+            group_titles.setdefault(group_id, {})[language_code] = title
+
+        units = {}
+        group_unit_ids: dict[int, list[int]] = {
+            group_id: [] for group_id in UnitGroup.objects.values_list('id', flat=True)
+        }
+        for unit_id, group_id, coefficient in Unit.objects.order_by('group', 'coefficient').values_list(
+            'id', 'group_id', 'coefficient'
+        ):
+            units[unit_id] = UnitEntry(
+                id=unit_id,
+                group_id=group_id,
+                coefficient=coefficient,
+                translations=MappingProxyType(unit_translations.get(unit_id, {})),
+            )
+            group_unit_ids.setdefault(group_id, []).append(unit_id)
+
+        groups = {
+            group_id: UnitGroupEntry(
+                id=group_id,
+                titles=MappingProxyType(group_titles.get(group_id, {})),
+                unit_ids=tuple(unit_ids),
+            )
+            for group_id, unit_ids in group_unit_ids.items()
+        }
+
+        return UnitCatalogueSnapshot(
+            version=version,
+            units=MappingProxyType(units),
+            groups=MappingProxyType(groups),
+            units_by_language=MappingProxyType(
+                {language: MappingProxyType(entries) for language, entries in units_by_language.items()}
+            ),
+        )
+
+
+unit_catalogue = UnitCatalogue()
@@ -0,0 +1,108 @@
+import dataclasses
+import threading
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from apps.unit.catalogue import UnitCatalogue, UnitCatalogueSnapshot, unit_catalogue
+
+__all__ = [
+    'ConversionRatio',
+    'UnitConversionMatrix',
+    'UnitConverter',
+    'unit_converter',
+]
+
+
+# Точный множитель перевода (числитель, знаменатель): коэффициенты исходной и целевой ед. измерений
+ConversionRatio = tuple[Decimal, Decimal]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UnitConversionMatrix:
+    """Коэффициенты перевода между всеми парами ед. измерений каждой группы.
+
+    Множитель хранится несокращенной дробью: частное коэффициентов может быть бесконечной дробью
+    (0.01 / 0.3048), и его округление дает ошибку в последнем знаке перевода, например 0.9999...
+    вместо 1 при переводе 30.48 см в футы.
+    """
+
+    snapshot: UnitCatalogueSnapshot
+    # id исходной ед. измерений -> id целевой ед. измерений -> (числитель, знаменатель)
+    factors: Mapping[int, Mapping[int, ConversionRatio]]
+
+    @classmethod
+    def build(cls, snapshot: UnitCatalogueSnapshot) -> 'UnitConversionMatrix':
+        factors = {}
+        for group_id in snapshot.groups:
+            units = snapshot.get_group_units(group_id)
+            for from_unit in units:
+                factors[from_unit.id] = MappingProxyType(
+                    {to_unit.id: (from_unit.coefficient, to_unit.coefficient) for to_unit in units}
+                )
+        return cls(snapshot=snapshot, factors=MappingProxyType(factors))
+
+
+class UnitConverter:
+    """Перевод количеств между ед. измерений одной группы.
+
+    Матрица коэффициентов строится по снимку каталога ед. измерений и перестраивается только
+    при смене снимка, поэтому перевод - это поиск множителя в словаре, умножение на числитель
+    и одно деление на знаменатель.
+    Для ед. измерений разных групп и неизвестных ед. измерений перевод невозможен и методы возвращают None.
+    """
+
+    def __init__(self, catalogue: UnitCatalogue = unit_catalogue) -> None:
+        self._catalogue = catalogue
+        self._matrix: UnitConversionMatrix | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def matrix(self) -> UnitConversionMatrix:
+        snapshot = self._catalogue.snapshot
+        matrix = self._matrix
+        if matrix is not None and matrix.snapshot is snapshot:
+            return matrix
+
+        with self._lock:
+            if self._matrix is None or self._matrix.snapshot is not snapshot:
+                self._matrix = UnitConversionMatrix.build(snapshot)
+            return self._matrix
+
+    def get_ratio(self, from_unit_id: int, to_unit_id: int) -> ConversionRatio | None:
+        """Точный множитель перевода из from_unit_id в to_unit_id или None, если перевод невозможен."""
+        factors = self.matrix.factors
+        if from_unit_id not in factors or to_unit_id not in factors:
+            # Ед. измерений могла появиться после загрузки каталога
+            self._catalogue.get_unit(from_unit_id if from_unit_id not in factors else to_unit_id)
+            factors = self.matrix.factors
+        return factors.get(from_unit_id, {}).get(to_unit_id)
+
+    def get_factor(self, from_unit_id: int, to_unit_id: int) -> Decimal | None:
+        """Множитель перевода из from_unit_id в to_unit_id или None, если перевод невозможен."""
+        ratio = self.get_ratio(from_unit_id, to_unit_id)
+        if ratio is None:
+            return None
+        numerator, denominator = ratio
+        return numerator / denominator
+
+    def can_convert(self, from_unit_id: int, to_unit_id: int) -> bool:
+        return self.get_ratio(from_unit_id, to_unit_id) is not None
+
+    def convert(self, value: Decimal, from_unit_id: int, to_unit_id: int) -> Decimal | None:
+        ratio = self.get_ratio(from_unit_id, to_unit_id)
+        if ratio is None:
+            return None
+        numerator, denominator = ratio
+        return value * numerator / denominator
+
+    def convert_many(self, values: Iterable[Decimal], from_unit_id: int, to_unit_id: int) -> list[Decimal] | None:
+        """Переводит список количеств с одним поиском множителя на весь список."""
+        ratio = self.get_ratio(from_unit_id, to_unit_id)
+        if ratio is None:
+            return None
+        numerator, denominator = ratio
+        return [value * numerator / denominator for value in values]
+
+
+unit_converter = UnitConverter()
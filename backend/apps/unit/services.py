@@ -1,5 +1,6 @@
 from django.utils.translation import get_language
 
+from apps.unit.catalogue import UnitTranslationEntry, unit_catalogue
 from apps.unit.models import Unit, UnitGroup, UnitGroupTranslation, UnitTranslation
 
 
@@ -82,3 +83,41 @@ class UnitTranslationService:
                 .first()
             )
         return translation
+
+
+class UnitTranslationResolver:
+    """Резолвер переводов ед. измерений в рамках одного запроса.
+
+    Переводы берутся из каталога ед. измерений, снимок которого фиксируется на время запроса.
+    """
+
+    def __init__(self, language: str | None = None) -> None:
+        self.language = get_language() if language is None else language
+        self._snapshot = unit_catalogue.snapshot
+
+    @classmethod
+    def from_context(cls, context: dict) -> 'UnitTranslationResolver':
+        """Возвращает резолвер, общий для всех сериализаторов одного запроса."""
+        language = get_language()
+        key = f'unit_translation_resolver:{language}'
+        if key not in context:
+            context[key] = cls(language=language)
+        return context[key]
+
+    def get_unit_translation(self, unit: Unit) -> UnitTranslationEntry | None:
+        """Возвращает локализованный вариант ед. измерений."""
+        return self.get_unit_translation_by_id(unit.id)
+
+    def get_unit_translation_by_id(self, unit_id: int) -> UnitTranslationEntry | None:
+        """Возвращает локализованный вариант ед. измерений по id."""
+        entry = self._snapshot.units.get(unit_id) or unit_catalogue.get_unit(unit_id)
+        if entry is None:
+            return None
+        return entry.get_translation(self.language)
+
+    def get_unit_group_title(self, group: UnitGroup) -> str | None:
+        """Возвращает локализованное наименование группы ед. измерений."""
+        entry = self._snapshot.groups.get(group.id) or unit_catalogue.get_group(group.id)
+        if entry is None:
+            return None
+        return entry.get_title(self.language)
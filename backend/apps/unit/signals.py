@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.unit.catalogue import unit_catalogue
+from apps.unit.models import Unit, UnitGroup, UnitGroupTranslation, UnitTranslation
+
+
+@receiver(post_save, sender=Unit)
+@receiver(post_delete, sender=Unit)
+@receiver(post_save, sender=UnitTranslation)
+@receiver(post_delete, sender=UnitTranslation)
+@receiver(post_save, sender=UnitGroup)
+@receiver(post_delete, sender=UnitGroup)
+@receiver(post_save, sender=UnitGroupTranslation)
+@receiver(post_delete, sender=UnitGroupTranslation)
+def invalidate_unit_catalogue(sender: type, **kwargs: Any) -> None:
+    """Сбрасывает каталог ед. измерений при изменении справочника."""
+    unit_catalogue.invalidate_on_commit()
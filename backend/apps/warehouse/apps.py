@@ -5,3 +5,6 @@ class WarehouseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.warehouse'
     label = 'warehouse'
+
+    def ready(self) -> None:
+        from apps.warehouse import signals  # noqa: F401
@@ -6,6 +6,8 @@ __all__ = [
     'StorageTypeChoices',
     'ContentTypeChoices',
     'ProductComponentChoices',
+    'ExportFormatChoices',
+    'StockMovementReasonChoices',
 ]
 
 
@@ -38,3 +40,19 @@ class ProductComponentChoices(models.TextChoices):
 
     MATERIAL = 'material', _('Материалы')
     RESOURCE = 'resource', _('Ресурсы')
+
+
+class ExportFormatChoices(models.TextChoices):
+    """Форматы выгрузки склада."""
+
+    CSV = 'csv', _('CSV')
+    NDJSON = 'ndjson', _('NDJSON')
+
+
+class StockMovementReasonChoices(models.TextChoices):
+    """Причины движения остатков."""
+
+    RECEIPT = 'receipt', _('Поступление')
+    WRITE_OFF = 'write_off', _('Списание')
+    ADJUSTMENT = 'adjustment', _('Корректировка')
+    PRODUCTION = 'production', _('Производство')
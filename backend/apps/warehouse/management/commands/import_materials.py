@@ -0,0 +1,51 @@
+import json
+import os
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from apps.warehouse.choices import ExportFormatChoices
+from apps.warehouse.models import Warehouse
+from apps.warehouse.services.material_import import MaterialImportService
+
+
+class Command(BaseCommand):
+    help = 'Imports warehouse materials from a CSV/NDJSON file'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument('warehouse_id', type=int, help='Warehouse ID')
+        parser.add_argument('file', type=str, help='Path to the CSV/NDJSON file')
+        parser.add_argument(
+            '--file-format',
+            choices=ExportFormatChoices.values,
+            help='File format, detected by the file extension if not passed',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        file_path: str = options['file']
+        if not os.path.exists(file_path):
+            raise CommandError(f'File {file_path} does not exist')
+
+        try:
+            warehouse = Warehouse.objects.get(id=options['warehouse_id'])
+        except Warehouse.DoesNotExist:
+            raise CommandError(f'Warehouse {options["warehouse_id"]} does not exist')
+
+        file_format = options['file_format'] or self._detect_file_format(file_path)
+
+        with open(file_path, 'rb') as file:
+            service = MaterialImportService(warehouse=warehouse, file=file, file_format=file_format)
+            try:
+                materials = service.run()
+            except serializers.ValidationError as e:
+                raise CommandError(json.dumps(e.detail, ensure_ascii=False, indent=2))
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully imported {len(materials)} materials'))
+
+    @staticmethod
+    def _detect_file_format(file_path: str) -> str:
+        if file_path.lower().endswith('.csv'):
+            return ExportFormatChoices.CSV
+        return ExportFormatChoices.NDJSON
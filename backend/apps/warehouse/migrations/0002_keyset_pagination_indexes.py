@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unit', '0002_unitgrouptranslation_unit_unitgr_group_i_ddbeae_idx_and_more'),
+        ('warehouse', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='warehouse_c_user_id_715723_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['warehouse', '-created_at', 'id'], name='warehouse_m_warehou_fac163_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['warehouse', '-created_at', 'id'], name='warehouse_p_warehou_11bb90_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='warehouse_r_user_id_b903bf_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+OWNER_LOOKUPS = {
+    'warehouse': 'user',
+    'resource': 'user',
+    'material': 'warehouse__user',
+    'product': 'warehouse__user',
+}
+
+
+def fill_owner(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    FileAttachment = apps.get_model('warehouse', 'FileAttachment')
+
+    for model_name, owner_lookup in OWNER_LOOKUPS.items():
+        content_type = ContentType.objects.filter(app_label='warehouse', model=model_name).first()
+        if content_type is None:
+            continue
+        model = apps.get_model('warehouse', model_name)
+        owner = model.objects.filter(pk=OuterRef('object_id')).values(owner_lookup)[:1]
+        FileAttachment.objects.filter(content_type=content_type).update(owner_id=Subquery(owner))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('warehouse', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileattachment',
+            name='owner',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Владелец'),
+        ),
+        migrations.RunPython(fill_owner, migrations.RunPython.noop),
+    ]
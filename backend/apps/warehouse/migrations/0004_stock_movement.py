@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('warehouse', '0003_fileattachment_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('delta', models.DecimalField(decimal_places=4, max_digits=12, verbose_name='Изменение остатка')),
+                ('remaining', models.DecimalField(decimal_places=4, max_digits=12, verbose_name='Остаток после изменения')),
+                ('reason', models.CharField(choices=[('receipt', 'Поступление'), ('write_off', 'Списание'), ('adjustment', 'Корректировка'), ('production', 'Производство')], max_length=20, verbose_name='Причина')),
+                ('comment', models.CharField(blank=True, default='', max_length=255, verbose_name='Комментарий')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('content_type', models.ForeignKey(limit_choices_to={'model__in': ['material', 'product']}, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='warehouse.warehouse', verbose_name='Склад')),
+            ],
+            options={
+                'verbose_name': 'Движение остатка',
+                'verbose_name_plural': 'Движения остатков',
+                'ordering': ('-created_at', '-id'),
+                'indexes': [models.Index(fields=['warehouse', '-created_at', 'id'], name='warehouse_s_warehou_7649d6_idx'), models.Index(fields=['content_type', 'object_id', '-created_at'], name='warehouse_s_content_1ffafd_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('unit', '0002_unitgrouptranslation_unit_unitgr_group_i_ddbeae_idx_and_more'),
+        ('warehouse', '0004_stock_movement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(condition=models.Q(('remaining__lt', models.F('min_remaining'))), fields=['warehouse'], name='warehouse_m_low_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('remaining__lt', models.F('min_remaining'))), fields=['warehouse'], name='warehouse_p_low_stock_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from .material import Material
 from .product_component import ProductComponent
 from .products import Product
 from .resource import Resource
+from .stock_movement import StockMovement
 from .warehouse import Warehouse
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     'ProductComponent',
     'Product',
     'Resource',
+    'StockMovement',
     'Warehouse',
 ]
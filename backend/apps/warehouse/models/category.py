@@ -24,12 +24,15 @@ class Category(BaseModel):
         choices=CategoryTypeChoices,
     )
 
+    owner_lookup = 'user'
+
     class Meta:
         ordering = ('-created_at',)
         verbose_name = _('Категория')
         verbose_name_plural = _('Категории')
         indexes = [
             models.Index(fields=['user']),
+            models.Index(fields=['user', '-created_at', 'id']),
         ]
 
     def user_obj_permission(self, user_id: int) -> bool:
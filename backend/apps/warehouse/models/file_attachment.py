@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -37,6 +38,16 @@ class FileAttachment(models.Model):
         upload_to=get_attachment_upload_path,
         verbose_name='Файл',
     )
+    # Владелец объекта вложения, хранится для проверки прав без загрузки объекта
+    owner = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='+',
+        null=True,
+        verbose_name='Владелец',
+    )
+
+    owner_lookup = 'owner'
 
     class Meta:
         indexes = [
@@ -46,8 +57,24 @@ class FileAttachment(models.Model):
     def __str__(self) -> str:
         return f'{self.file.name}'
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self.owner_id is None:
+            self.owner_id = self.get_owner_id(self.content_type_id, self.object_id)
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def get_owner_id(content_type_id: int, object_id: int) -> int | None:
+        """Возвращает id владельца объекта одним запросом по пути owner_lookup модели."""
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        owner_lookup = getattr(model, 'owner_lookup', None)
+        if owner_lookup is None:
+            return None
+        return model.objects.filter(pk=object_id).values_list(owner_lookup, flat=True).first()
+
     def user_obj_permission(self, user_id: int) -> bool:
         """Проверяет, имеет ли пользователь право на операцию над моделью."""
+        if self.owner_id is not None:
+            return self.owner_id == user_id
         model_instance = self.content_type.model_class().objects.filter(pk=self.object_id).first()
         if hasattr(model_instance, 'user_obj_permission'):
             return model_instance.user_obj_permission(user_id)
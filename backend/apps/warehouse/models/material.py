@@ -13,6 +13,11 @@ class Material(StorageEntity):
         related_query_name='materials',
     )
 
+    stock_movements = GenericRelation(
+        'warehouse.StockMovement',
+        related_query_name='materials',
+    )
+
     warehouse = models.ForeignKey(
         verbose_name=_('Склад'),
         to='warehouse.Warehouse',
@@ -20,6 +25,8 @@ class Material(StorageEntity):
         related_name='materials',
     )
 
+    owner_lookup = 'warehouse__user'
+
     class Meta:
         ordering = ('-created_at',)
         verbose_name = _('Материал')
@@ -27,6 +34,13 @@ class Material(StorageEntity):
         indexes = [
             models.Index(fields=['warehouse']),
             models.Index(fields=['unit']),
+            models.Index(fields=['warehouse', '-created_at', 'id']),
+            # Частичный индекс содержит только позиции с нехваткой остатка
+            models.Index(
+                fields=['warehouse'],
+                condition=models.Q(remaining__lt=models.F('min_remaining')),
+                name='warehouse_m_low_stock_idx',
+            ),
         ]
 
     def user_obj_permission(self, user_id: int) -> bool:
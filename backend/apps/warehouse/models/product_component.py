@@ -1,9 +1,25 @@
+from django.apps import apps
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+class ProductComponentQuerySet(models.QuerySet):
+    def with_component(self) -> 'ProductComponentQuerySet':
+        """Загружает материалы и ресурсы компонентов пакетно, одним запросом на тип объекта."""
+        return self.prefetch_related(
+            GenericPrefetch(
+                'component',
+                [
+                    apps.get_model('warehouse', 'Material').objects.all(),
+                    apps.get_model('warehouse', 'Resource').objects.all(),
+                ],
+            )
+        )
+
+
 class ProductComponent(models.Model):
     product = models.ForeignKey(
         verbose_name='Продукт',
@@ -35,6 +51,10 @@ class ProductComponent(models.Model):
         'object_id',
     )
 
+    objects = ProductComponentQuerySet.as_manager()
+
+    owner_lookup = 'product__warehouse__user'
+
     class Meta:
         unique_together = (
             'product',
@@ -18,6 +18,11 @@ class Product(StorageEntity):
         related_query_name='products',
     )
 
+    stock_movements = GenericRelation(
+        'warehouse.StockMovement',
+        related_query_name='products',
+    )
+
     warehouse = models.ForeignKey(
         verbose_name=_('Склад'),
         to='warehouse.Warehouse',
@@ -25,6 +30,8 @@ class Product(StorageEntity):
         related_name='products',
     )
 
+    owner_lookup = 'warehouse__user'
+
     class Meta:
         ordering = ('-created_at',)
         verbose_name = _('Продукт')
@@ -32,6 +39,13 @@ class Product(StorageEntity):
         indexes = [
             models.Index(fields=['warehouse']),
             models.Index(fields=['unit']),
+            models.Index(fields=['warehouse', '-created_at', 'id']),
+            # Частичный индекс содержит только позиции с нехваткой остатка
+            models.Index(
+                fields=['warehouse'],
+                condition=models.Q(remaining__lt=models.F('min_remaining')),
+                name='warehouse_p_low_stock_idx',
+            ),
         ]
 
     def user_obj_permission(self, user_id: int) -> bool:
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.db.models import Q
@@ -71,12 +73,15 @@ class Resource(BaseModel):
         default='',
     )
 
+    owner_lookup = 'user'
+
     class Meta:
         verbose_name = _('Ресурс')
         verbose_name_plural = _('Ресурсы')
         indexes = [
             models.Index(fields=['unit']),
             models.Index(fields=['user']),
+            models.Index(fields=['user', '-created_at', 'id']),
         ]
         constraints = [
             models.CheckConstraint(
@@ -97,3 +102,14 @@ class Resource(BaseModel):
     def user_obj_permission(self, user_id: int) -> bool:
         """Проверяет, имеет ли пользователь право на операцию над моделью."""
         return self.user_id == user_id
+
+    def get_unit_price(self) -> Decimal | None:
+        """Цена за единицу ресурса.
+
+        Для амортизируемого ресурса - первоначальная стоимость, деленная на срок службы.
+        """
+        if not self.is_depreciation:
+            return self.price
+        if not self.service_life:
+            return None
+        return self.initial_price / self.service_life
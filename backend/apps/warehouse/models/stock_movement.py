@@ -0,0 +1,87 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.warehouse.choices import StockMovementReasonChoices
+
+
+class StockMovement(models.Model):
+    """Движение остатка материала/продукта.
+
+    Журнал только дополняется: каждая запись хранит изменение остатка и остаток после него.
+    """
+
+    warehouse = models.ForeignKey(
+        verbose_name=_('Склад'),
+        to='warehouse.Warehouse',
+        on_delete=models.CASCADE,
+        related_name='stock_movements',
+    )
+
+    content_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        limit_choices_to={'model__in': ['material', 'product']},
+    )
+    object_id = models.PositiveIntegerField()
+    entity = GenericForeignKey(
+        'content_type',
+        'object_id',
+    )
+
+    delta = models.DecimalField(
+        verbose_name=_('Изменение остатка'),
+        max_digits=12,
+        decimal_places=4,
+    )
+
+    remaining = models.DecimalField(
+        verbose_name=_('Остаток после изменения'),
+        max_digits=12,
+        decimal_places=4,
+    )
+
+    reason = models.CharField(
+        verbose_name=_('Причина'),
+        max_length=20,
+        choices=StockMovementReasonChoices,
+    )
+
+    comment = models.CharField(
+        verbose_name=_('Комментарий'),
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+    created_by = models.ForeignKey(
+        verbose_name=_('Пользователь'),
+        to='users.User',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name=_('Дата создания'),
+        auto_now_add=True,
+    )
+
+    owner_lookup = 'warehouse__user'
+
+    class Meta:
+        ordering = ('-created_at', '-id')
+        verbose_name = _('Движение остатка')
+        verbose_name_plural = _('Движения остатков')
+        indexes = [
+            models.Index(fields=['warehouse', '-created_at', 'id']),
+            models.Index(fields=['content_type', 'object_id', '-created_at']),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.entity} ({self.delta:+})'
+
+    def user_obj_permission(self, user_id: int) -> bool:
+        """Проверяет, имеет ли пользователь право на операцию над моделью."""
+        return self.warehouse.user_obj_permission(user_id)
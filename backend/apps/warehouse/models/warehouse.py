@@ -38,6 +38,8 @@ class Warehouse(BaseModel):
         related_query_name='storage',
     )
 
+    owner_lookup = 'user'
+
     class Meta:
         ordering = ('-created_at',)
         verbose_name = _('Склад')
@@ -1,13 +1,15 @@
 import dataclasses
 from decimal import Decimal
 
+from django.core.files import File
+
 from apps.unit.models import Unit
 
 
 @dataclasses.dataclass
 class AttachmentsDTO:
     filename: str | None = None
-    file: bytes | None = None
+    file: File | None = None
 
 
 @dataclasses.dataclass
@@ -18,3 +20,11 @@ class ProductComponentDTO:
     unit: Unit
     user_id: int
     id: int | None = None
+
+
+@dataclasses.dataclass
+class StockAdjustmentDTO:
+    entity_id: int
+    delta: Decimal
+    reason: str
+    comment: str = ''
@@ -0,0 +1,5 @@
+from apps.warehouse.services.export.service import WarehouseExportService
+
+__all__ = [
+    'WarehouseExportService',
+]
@@ -0,0 +1,117 @@
+import csv
+import dataclasses
+import json
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, QuerySet
+from django.utils.translation import get_language
+
+from apps.unit.catalogue import unit_catalogue
+from apps.warehouse.choices import ExportFormatChoices, StorageTypeChoices
+from apps.warehouse.models import Category, Material, Product, Warehouse
+
+
+class _EchoBuffer:
+    """Псевдо-файл для csv.writer, возвращающий записанную строку вместо ее буферизации."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+@dataclasses.dataclass
+class WarehouseExportService:
+    """Потоковая выгрузка материалов или продуктов склада в CSV/NDJSON.
+
+    Объекты читаются серверным курсором порциями по CHUNK_SIZE, категории подгружаются
+    для каждой порции отдельно, ед. измерений берутся из каталога. Память не зависит от размера склада.
+    """
+
+    warehouse: Warehouse
+    file_format: str
+    language: str | None = None
+
+    CHUNK_SIZE = 2000
+    CATEGORIES_SEPARATOR = ';'
+
+    FIELDS = [
+        'id',
+        'title',
+        'sku',
+        'notes',
+        'price',
+        'remaining',
+        'min_remaining',
+        'unit_id',
+        'unit_title',
+        'unit_short_title',
+        'category_ids',
+        'category_titles',
+    ]
+
+    CONTENT_TYPES = {
+        ExportFormatChoices.CSV: 'text/csv; charset=utf-8',
+        ExportFormatChoices.NDJSON: 'application/x-ndjson; charset=utf-8',
+    }
+
+    def __post_init__(self) -> None:
+        if self.language is None:
+            self.language = get_language()
+
+    @property
+    def content_type(self) -> str:
+        return self.CONTENT_TYPES[self.file_format]
+
+    @property
+    def file_name(self) -> str:
+        return f'warehouse_{self.warehouse.id}_{self.warehouse.storage_type}.{self.file_format}'
+
+    @property
+    def queryset(self) -> QuerySet[Material | Product]:
+        model = Product if self.warehouse.storage_type == StorageTypeChoices.PRODUCT else Material
+        return (
+            model.objects.filter(warehouse=self.warehouse)
+            .only('id', 'title', 'sku', 'notes', 'price', 'remaining', 'min_remaining', 'unit_id')
+            .prefetch_related(Prefetch('categories', queryset=Category.objects.only('id', 'title')))
+            .order_by('id')
+        )
+
+    def stream(self) -> Iterator[str]:
+        if self.file_format == ExportFormatChoices.CSV:
+            return self._stream_csv()
+        return self._stream_ndjson()
+
+    def rows(self) -> Iterator[dict]:
+        snapshot = unit_catalogue.snapshot
+        for instance in self.queryset.iterator(chunk_size=self.CHUNK_SIZE):
+            unit = snapshot.units.get(instance.unit_id) or unit_catalogue.get_unit(instance.unit_id)
+            translation = unit.get_translation(self.language) if unit else None
+            categories = list(instance.categories.all())
+            yield {
+                'id': instance.id,
+                'title': instance.title,
+                'sku': instance.sku,
+                'notes': instance.notes,
+                'price': instance.price,
+                'remaining': instance.remaining,
+                'min_remaining': instance.min_remaining,
+                'unit_id': instance.unit_id,
+                'unit_title': translation.title if translation else None,
+                'unit_short_title': translation.short_title if translation else None,
+                'category_ids': [category.id for category in categories],
+                'category_titles': [category.title for category in categories],
+            }
+
+    def _stream_ndjson(self) -> Iterator[str]:
+        for row in self.rows():
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+    def _stream_csv(self) -> Iterator[str]:
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(self.FIELDS)
+        for row in self.rows():
+            row['category_ids'] = self.CATEGORIES_SEPARATOR.join(
+                str(category_id) for category_id in row['category_ids']
+            )
+            row['category_titles'] = self.CATEGORIES_SEPARATOR.join(row['category_titles'])
+            yield writer.writerow([row[field] for field in self.FIELDS])
@@ -1,7 +1,11 @@
 import dataclasses
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.files.base import ContentFile
+from django.core.files import File
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
 
 from apps.warehouse.choices import ContentTypeChoices
 from apps.warehouse.models import FileAttachment, Material, Product, Resource, Warehouse
@@ -9,8 +13,19 @@ from apps.warehouse.models import FileAttachment, Material, Product, Resource, W
 
 @dataclasses.dataclass
 class FileAttachmentCreateService:
-    filename: str
-    file: bytes
+    """Сервис создания вложения.
+
+    Файл не читается в память: хранилище копирует его по частям, а загрузку,
+    сохраненную во временный файл, перемещает без копирования.
+    """
+
+    file: File
+    user_id: int
+    filename: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.filename is None:
+            self.filename = self.file.name
 
     @property
     def content_type_map(self) -> dict:
@@ -21,6 +36,12 @@ class FileAttachmentCreateService:
             ContentTypeChoices.WAREHOUSE: ContentType.objects.get_for_model(Warehouse),
         }
 
+    def validate(self) -> None:
+        if self.file.size > settings.FILE_ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError(
+                {'file': _('Размер файла превышает допустимый: ') + filesizeformat(settings.FILE_ATTACHMENT_MAX_SIZE)}
+            )
+
     def create(
         self,
         content_type_str: str,
@@ -29,7 +50,13 @@ class FileAttachmentCreateService:
         content_type = self.content_type_map.get(content_type_str)
         if content_type is None:
             raise Exception(f'Unknown content type "{content_type_str}"')
-        content_file = ContentFile(self.file, name=self.filename)
-        attachment = FileAttachment(content_type=content_type, object_id=object_id, file=content_file)
+        self.validate()
+
+        owner_id = FileAttachment.get_owner_id(content_type.id, object_id)
+        if owner_id is None or owner_id != self.user_id:
+            raise serializers.ValidationError({'object_id': _('Объект не найден')})
+
+        attachment = FileAttachment(content_type=content_type, object_id=object_id, owner_id=owner_id)
+        attachment.file.save(self.filename, self.file, save=False)
         attachment.save()
         return attachment
@@ -3,14 +3,13 @@ from decimal import Decimal
 from functools import cached_property
 
 from django.db import transaction
-from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from apps.unit.models import Unit
 from apps.warehouse.choices import CategoryTypeChoices, StorageTypeChoices
-from apps.warehouse.models import Category, Material, Warehouse
-from apps.warehouse.validators.category import category_type_validate, warehouse_category_and_entity_validate
+from apps.warehouse.models import Material, Warehouse
+from apps.warehouse.validators.category import CategoryValidator
 
 
 @dataclasses.dataclass
@@ -24,10 +23,11 @@ class MaterialService:
     sku: str
     notes: str
     price: Decimal
-    remaining: Decimal
     min_remaining: Decimal
 
     categories_id: list[int] = lambda: []
+    # Начальный остаток, учитывается только при создании: дальше остаток меняется через журнал движений
+    remaining: Decimal = Decimal(0)
 
     def create(self) -> Material:
         self.validate()
@@ -44,7 +44,7 @@ class MaterialService:
                 min_remaining=self.min_remaining,
             )
 
-            material.categories.set(self.categories_qs)
+            material.categories.set(self.category_validator.categories)
 
         return material
 
@@ -57,11 +57,11 @@ class MaterialService:
             material.sku = self.sku
             material.notes = self.notes
             material.price = self.price
-            material.remaining = self.remaining
             material.min_remaining = self.min_remaining
 
-            material.save()
-            material.categories.set(self.categories_qs)
+            # Без remaining: сохранение не должно затирать изменения остатка, сделанные после загрузки объекта
+            material.save(update_fields=['unit', 'title', 'sku', 'notes', 'price', 'min_remaining', 'updated_at'])
+            material.categories.set(self.category_validator.categories)
 
         return material
 
@@ -69,16 +69,12 @@ class MaterialService:
         if self.warehouse.storage_type != StorageTypeChoices.MATERIAL:
             raise serializers.ValidationError({'warehouse': _('Склад не предназначен для материалов')})
 
-        if self.categories_qs:
-            warehouse_category_and_entity_validate(
-                warehouse=self.warehouse,
-                entity_categories=self.categories_qs,
-            )
-            category_type_validate(
-                categories=self.categories_qs,
-                category_type=CategoryTypeChoices.MATERIAL,
-            )
+        self.category_validator.validate()
 
     @cached_property
-    def categories_qs(self) -> QuerySet[Category]:
-        return Category.objects.filter(id__in=self.categories_id)
+    def category_validator(self) -> CategoryValidator:
+        return CategoryValidator(
+            categories_id=self.categories_id,
+            category_type=CategoryTypeChoices.MATERIAL,
+            warehouse=self.warehouse,
+        )
@@ -0,0 +1,5 @@
+from apps.warehouse.services.material_import.service import MaterialImportService
+
+__all__ = [
+    'MaterialImportService',
+]
@@ -0,0 +1,189 @@
+import csv
+import dataclasses
+import io
+import json
+from decimal import Decimal
+from functools import cached_property
+from typing import IO, Iterator, Mapping
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.common.cache import owner_cache_version
+from apps.unit.catalogue import UnitEntry, unit_catalogue
+from apps.warehouse.choices import CategoryTypeChoices, ExportFormatChoices, StorageTypeChoices
+from apps.warehouse.models import Category, Material, Warehouse
+from apps.warehouse.validators.category import CategoryValidator
+
+
+class MaterialImportRowSerializer(serializers.Serializer):
+    """Строка файла импорта материалов. Формат совпадает с выгрузкой склада."""
+
+    title = serializers.CharField(max_length=255)
+    sku = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    price = serializers.DecimalField(max_digits=12, decimal_places=2)
+    remaining = serializers.DecimalField(max_digits=12, decimal_places=4, required=False, default=Decimal(0))
+    min_remaining = serializers.DecimalField(max_digits=12, decimal_places=4, required=False, allow_null=True)
+    unit_id = serializers.IntegerField(min_value=1)
+    category_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+
+
+@dataclasses.dataclass
+class MaterialImportService:
+    """Пакетный импорт материалов склада из CSV/NDJSON.
+
+    Ед. измерений берутся из каталога, категории всех строк загружаются одним запросом.
+    Строки проверяются целиком до записи, ошибки возвращаются по индексу строки.
+    Материалы и их категории вставляются через bulk_create в одной транзакции.
+    """
+
+    warehouse: Warehouse
+    file: IO[bytes]
+    file_format: str
+
+    BATCH_SIZE = 1000
+    CATEGORIES_SEPARATOR = ';'
+
+    @cached_property
+    def row_serializer(self) -> MaterialImportRowSerializer:
+        # Один экземпляр сериализатора на весь файл: поля строятся один раз
+        return MaterialImportRowSerializer()
+
+    def run(self) -> list[Material]:
+        if self.warehouse.storage_type != StorageTypeChoices.MATERIAL:
+            raise serializers.ValidationError({'warehouse': _('Склад не предназначен для материалов')})
+
+        rows = self._validate()
+
+        materials = [
+            Material(
+                warehouse=self.warehouse,
+                unit_id=row['unit_id'],
+                title=row['title'],
+                sku=row['sku'],
+                notes=row['notes'],
+                price=row['price'],
+                remaining=row['remaining'],
+                min_remaining=row.get('min_remaining'),
+            )
+            for row in rows
+        ]
+
+        through = Material.categories.through
+        with transaction.atomic():
+            Material.objects.bulk_create(materials, batch_size=self.BATCH_SIZE)
+            through.objects.bulk_create(
+                [
+                    through(material_id=material.id, category_id=category_id)
+                    for material, row in zip(materials, rows)
+                    for category_id in dict.fromkeys(row['category_ids'])
+                ],
+                batch_size=self.BATCH_SIZE,
+            )
+            owner_cache_version.bump_on_commit(self.warehouse.user_id)
+
+        return materials
+
+    def _validate(self) -> list[dict]:
+        errors = {}
+        rows = []
+        for i, data in enumerate(self._read()):
+            if i >= settings.MATERIAL_IMPORT_MAX_ROWS:
+                raise serializers.ValidationError(
+                    {'file': _('Превышено максимальное количество строк: ') + str(settings.MATERIAL_IMPORT_MAX_ROWS)}
+                )
+            if data is None:
+                errors[i] = {'non_field_errors': [_('Строка не является JSON объектом')]}
+                continue
+            try:
+                rows.append(self.row_serializer.run_validation(data))
+            except serializers.ValidationError as e:
+                errors[i] = e.detail
+                rows.append(None)
+
+        if not rows:
+            raise serializers.ValidationError({'file': _('Файл не содержит строк')})
+
+        category_validator = CategoryValidator(
+            categories_id=list({category_id for row in rows if row is not None for category_id in row['category_ids']}),
+            category_type=CategoryTypeChoices.MATERIAL,
+            warehouse=self.warehouse,
+        )
+        categories = {category.id: category for category in category_validator.categories}
+        units = unit_catalogue.snapshot.units
+        if any(row['unit_id'] not in units for row in rows if row is not None):
+            # Ед. измерения могли появиться после загрузки каталога
+            units = unit_catalogue.refresh().units
+
+        for i, row in enumerate(rows):
+            if row is None:
+                continue
+            error = self._get_row_error(row, units, categories, category_validator)
+            if error is not None:
+                errors[i] = error
+
+        if errors:
+            raise serializers.ValidationError({'rows': errors})
+
+        return rows
+
+    @staticmethod
+    def _get_row_error(
+        row: dict,
+        units: Mapping[int, UnitEntry],
+        categories: dict[int, Category],
+        category_validator: CategoryValidator,
+    ) -> dict | None:
+        if row['unit_id'] not in units:
+            return {'unit_id': _('Единица измерения не найдена')}
+
+        missing = [str(category_id) for category_id in row['category_ids'] if category_id not in categories]
+        if missing:
+            return {'category_ids': _('Категории не найдены: ') + ', '.join(missing)}
+
+        error = category_validator.get_error([categories[category_id] for category_id in row['category_ids']])
+        if error is not None:
+            return {'category_ids': error['categories']}
+
+        return None
+
+    def _read(self) -> Iterator[dict | None]:
+        text = io.TextIOWrapper(self.file, encoding='utf-8-sig', newline='')
+        try:
+            if self.file_format == ExportFormatChoices.CSV:
+                yield from self._read_csv(text)
+            else:
+                yield from self._read_ndjson(text)
+        except UnicodeDecodeError:
+            raise serializers.ValidationError({'file': _('Файл должен быть в кодировке UTF-8')}) from None
+        except csv.Error as e:
+            raise serializers.ValidationError({'file': _('Некорректный CSV: ') + str(e)}) from None
+        finally:
+            # Не закрываем исходный файл вместе с оберткой
+            text.detach()
+
+    def _read_csv(self, text: IO[str]) -> Iterator[dict]:
+        for data in csv.DictReader(text):
+            # Пустые ячейки считаются не переданными значениями
+            data = {key: value for key, value in data.items() if key and value not in ('', None)}
+            if 'category_ids' in data:
+                data['category_ids'] = [
+                    category_id.strip()
+                    for category_id in data['category_ids'].split(self.CATEGORIES_SEPARATOR)
+                    if category_id.strip()
+                ]
+            yield data
+
+    @staticmethod
+    def _read_ndjson(text: IO[str]) -> Iterator[dict | None]:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line, parse_float=Decimal)
+            except json.JSONDecodeError:
+                data = None
+            yield data if isinstance(data, dict) else None
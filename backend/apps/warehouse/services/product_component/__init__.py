@@ -1,6 +1,7 @@
-from .services import ProductComponentCreateService, ProductComponentUpdateService
+from .services import ProductComponentBulkService, ProductComponentCreateService, ProductComponentUpdateService
 
 __all__ = [
+    'ProductComponentBulkService',
     'ProductComponentCreateService',
     'ProductComponentUpdateService',
-]
\ No newline at end of file
+]
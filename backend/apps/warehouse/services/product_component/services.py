@@ -1,14 +1,20 @@
 import dataclasses
+from collections import defaultdict
 from decimal import Decimal
 from functools import cached_property
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from apps.common.cache import owner_cache_version
+from apps.unit.converter import unit_converter
 from apps.unit.models import Unit
 from apps.warehouse.choices import ProductComponentChoices
 from apps.warehouse.models import Material, Product, ProductComponent, Resource
+from apps.warehouse.services.dto import ProductComponentDTO
+from apps.warehouse.services.product_cost import product_cost_cache
 
 
 @dataclasses.dataclass
@@ -41,9 +47,7 @@ class ProductComponentBaseService:
     def component_instance(self) -> Material | Resource:
         component_model = self.content_type_instance.model_class()
         try:
-            instance = component_model.objects.select_related(
-                'unit',
-            ).get(id=self.object_id)
+            instance = component_model.objects.get(id=self.object_id)
         except component_model.DoesNotExist:
             raise serializers.ValidationError({'object_id': _('Объект не найден')})
         return instance
@@ -55,7 +59,7 @@ class ProductComponentBaseService:
         if not self.component_instance.user_obj_permission(self.user_id):
             raise serializers.ValidationError({'content_type': _('Компонент не принадлежит пользователю')})
 
-        if self.unit.group_id != self.component_instance.unit.group_id:
+        if not unit_converter.can_convert(self.unit.id, self.component_instance.unit_id):
             raise serializers.ValidationError({'unit': _('Выбрана единица измерения не соответсвующая продукту')})
 
         if (
@@ -96,3 +100,144 @@ class ProductComponentUpdateService(ProductComponentBaseService):
         instance.save()
 
         return instance
+
+
+@dataclasses.dataclass
+class ProductComponentBulkService:
+    """Пакетное создание и обновление компонентов продукта.
+
+    Все компоненты проверяются за один проход по заранее загруженным материалам, ресурсам
+    и текущему составу продукта, после чего сохраняются через bulk_update/bulk_create.
+    Ошибки возвращаются по индексу компонента, как и при поштучном сохранении.
+
+    Уникальность (product, content_type, object_id) проверяется БД построчно внутри UPDATE,
+    поэтому компоненты, меняющие объект, сохраняются отдельными запросами в порядке запроса:
+    компонент, освобождающий объект, записывается раньше компонента, который его занимает.
+    """
+
+    product: Product
+    components: list[ProductComponentDTO]
+
+    UPDATE_FIELDS = ['quantity', 'unit', 'content_type', 'object_id']
+
+    @cached_property
+    def content_type_map(self) -> dict[str, ContentType]:
+        return {
+            ProductComponentChoices.MATERIAL: ContentType.objects.get_for_model(Material),
+            ProductComponentChoices.RESOURCE: ContentType.objects.get_for_model(Resource),
+        }
+
+    @cached_property
+    def existing_components(self) -> dict[int, ProductComponent]:
+        components = ProductComponent.objects.filter(product=self.product)
+        return {component.id: component for component in components}
+
+    @cached_property
+    def component_objects(self) -> dict[tuple[str, int], tuple[int, int]]:
+        """Ед. измерения и владелец объектов компонентов по ключу (content_type, object_id)."""
+        ids_by_type = defaultdict(set)
+        for component in self.components:
+            ids_by_type[component.content_type].add(component.object_id)
+
+        objects = {}
+        if ids_by_type[ProductComponentChoices.MATERIAL]:
+            materials = Material.objects.filter(id__in=ids_by_type[ProductComponentChoices.MATERIAL]).values_list(
+                'id', 'unit_id', 'warehouse__user_id'
+            )
+            for object_id, unit_id, user_id in materials:
+                objects[(ProductComponentChoices.MATERIAL, object_id)] = (unit_id, user_id)
+        if ids_by_type[ProductComponentChoices.RESOURCE]:
+            resources = Resource.objects.filter(id__in=ids_by_type[ProductComponentChoices.RESOURCE]).values_list(
+                'id', 'unit_id', 'user_id'
+            )
+            for object_id, unit_id, user_id in resources:
+                objects[(ProductComponentChoices.RESOURCE, object_id)] = (unit_id, user_id)
+        return objects
+
+    def save(self) -> None:
+        to_update, to_move, to_create = self._validate()
+
+        try:
+            with transaction.atomic():
+                # Сначала обновления, чтобы освободить пары (content_type, object_id) для новых компонентов
+                if to_update:
+                    ProductComponent.objects.bulk_update(to_update, fields=self.UPDATE_FIELDS)
+                for instance in to_move:
+                    ProductComponent.objects.bulk_update([instance], fields=self.UPDATE_FIELDS)
+                if to_create:
+                    ProductComponent.objects.bulk_create(to_create)
+        except IntegrityError:
+            # Состав продукта изменен параллельным запросом
+            raise serializers.ValidationError({'components': _('Компонент уже находится в составе продукта')})
+
+        # bulk_create/bulk_update не отправляют сигналы сохранения
+        owner_cache_version.bump_on_commit(self.product.warehouse.user_id)
+        product_cost_cache.invalidate_on_commit([self.product.id])
+
+    def _validate(self) -> tuple[list[ProductComponent], list[ProductComponent], list[ProductComponent]]:
+        """Возвращает компоненты с прежним объектом, компоненты, меняющие объект, и новые компоненты."""
+        errors = {}
+        to_update = []
+        to_move = []
+        to_create = []
+
+        # Текущий состав продукта, изменяемый по мере прохода, как при поштучном сохранении
+        occupied = {
+            (component.content_type_id, component.object_id): component.id
+            for component in self.existing_components.values()
+        }
+
+        for i, component in enumerate(self.components):
+            content_type = self.content_type_map[component.content_type]
+            instance = self.existing_components.get(component.id)
+            key = (content_type.id, component.object_id)
+
+            error = self._get_error(component)
+            if error is None and key in occupied and (instance is None or occupied[key] != instance.id):
+                error = {'object_id': _('Компонент уже находится в составе продукта')}
+            if error is not None:
+                errors[i] = error
+                continue
+
+            if instance:
+                previous_key = (instance.content_type_id, instance.object_id)
+                occupied.pop(previous_key, None)
+                instance.quantity = component.quantity
+                instance.unit = component.unit
+                instance.content_type = content_type
+                instance.object_id = component.object_id
+                (to_update if key == previous_key else to_move).append(instance)
+                occupied[key] = instance.id
+            else:
+                to_create.append(
+                    ProductComponent(
+                        product=self.product,
+                        unit=component.unit,
+                        quantity=component.quantity,
+                        content_type=content_type,
+                        object_id=component.object_id,
+                    )
+                )
+                occupied[key] = None
+
+        if errors:
+            raise serializers.ValidationError({'components': errors})
+
+        return to_update, to_move, to_create
+
+    def _get_error(self, component: ProductComponentDTO) -> dict | None:
+        if component.quantity < 0:
+            return {'quantity': _('Количество должно быть положительным')}
+
+        component_object = self.component_objects.get((component.content_type, component.object_id))
+        if component_object is None:
+            return {'object_id': _('Объект не найден')}
+
+        unit_id, user_id = component_object
+        if user_id != component.user_id:
+            return {'content_type': _('Компонент не принадлежит пользователю')}
+
+        if not unit_converter.can_convert(component.unit.id, unit_id):
+            return {'unit': _('Выбрана единица измерения не соответсвующая продукту')}
+
+        return None
@@ -0,0 +1,10 @@
+from apps.warehouse.services.product_cost.cache import ProductCostCache, product_cost_cache
+from apps.warehouse.services.product_cost.dto import ProductCost
+from apps.warehouse.services.product_cost.service import ProductCostService
+
+__all__ = [
+    'ProductCost',
+    'ProductCostCache',
+    'ProductCostService',
+    'product_cost_cache',
+]
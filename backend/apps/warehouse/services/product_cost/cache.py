@@ -0,0 +1,64 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+
+from apps.unit.catalogue import unit_catalogue
+from apps.warehouse.models import Material, ProductComponent, Resource
+from apps.warehouse.services.product_cost.dto import ProductCost
+
+
+class ProductCostCache:
+    """Кэш себестоимости продуктов.
+
+    Себестоимость хранится отдельно по каждому продукту, ключ включает версию каталога ед. измерений.
+    При изменении материала, ресурса или состава сбрасываются записи только затронутых продуктов,
+    и при следующем расчете пересчитываются только они.
+    """
+
+    KEY_TEMPLATE = 'product:{product_id}:cost:{catalogue_version}'
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.PRODUCT_COST_CACHE_ALIAS]
+
+    def get_many(self, product_ids: Iterable[int]) -> dict[int, ProductCost]:
+        keys = {self._get_key(product_id): product_id for product_id in product_ids}
+        return {keys[key]: cost for key, cost in self.cache.get_many(keys).items()}
+
+    def set_many(self, costs: Iterable[ProductCost]) -> None:
+        self.cache.set_many(
+            {self._get_key(cost.product_id): cost for cost in costs},
+            timeout=settings.PRODUCT_COST_CACHE_TIMEOUT,
+        )
+
+    def invalidate(self, product_ids: Iterable[int]) -> None:
+        self.cache.delete_many([self._get_key(product_id) for product_id in product_ids])
+
+    def invalidate_on_commit(self, product_ids: Iterable[int]) -> None:
+        """Сбрасывает себестоимость сразу и повторно после коммита транзакции."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        self.invalidate(product_ids)
+        # Повторно после коммита: себестоимость могла быть рассчитана до фиксации транзакции
+        transaction.on_commit(lambda: self.invalidate(product_ids))
+
+    def invalidate_component(self, model: type[Material | Resource], object_id: int) -> None:
+        """Сбрасывает себестоимость продуктов, в состав которых входит материал или ресурс."""
+        self.invalidate_on_commit(
+            ProductComponent.objects.filter(
+                content_type=ContentType.objects.get_for_model(model),
+                object_id=object_id,
+            ).values_list('product_id', flat=True)
+        )
+
+    @classmethod
+    def _get_key(cls, product_id: int) -> str:
+        return cls.KEY_TEMPLATE.format(product_id=product_id, catalogue_version=unit_catalogue.snapshot.version)
+
+
+product_cost_cache = ProductCostCache()
@@ -0,0 +1,12 @@
+import dataclasses
+from decimal import Decimal
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ProductCost:
+    """Себестоимость продукта."""
+
+    product_id: int
+    cost: Decimal
+    # False, если часть компонентов ссылается на удаленные объекты или ед. измерения
+    is_complete: bool
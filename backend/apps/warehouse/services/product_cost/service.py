@@ -0,0 +1,84 @@
+import dataclasses
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+
+from apps.unit.converter import unit_converter
+from apps.warehouse.models import Material, Product, ProductComponent, Resource, Warehouse
+from apps.warehouse.services.product_cost.cache import product_cost_cache
+from apps.warehouse.services.product_cost.dto import ProductCost
+
+
+@dataclasses.dataclass
+class ProductCostService:
+    """Себестоимость продуктов склада по их составу.
+
+    Стоимость компонента - количество, переведенное из ед. измерения компонента в ед. измерения
+    материала/ресурса через коэффициенты, умноженное на цену за единицу. Для амортизируемого
+    ресурса цена за единицу - первоначальная стоимость, деленная на срок службы.
+
+    Продукты из кэша не пересчитываются, остальные считаются за постоянное число запросов:
+    компоненты продуктов, их материалы и ресурсы загружаются пакетно по типу объекта.
+    """
+
+    warehouse: Warehouse
+
+    def calculate(self) -> list[ProductCost]:
+        product_ids = list(Product.objects.filter(warehouse=self.warehouse).values_list('id', flat=True))
+
+        costs = product_cost_cache.get_many(product_ids)
+        missing = [product_id for product_id in product_ids if product_id not in costs]
+        if missing:
+            calculated = self._calculate(missing)
+            product_cost_cache.set_many(calculated)
+            costs.update((cost.product_id, cost) for cost in calculated)
+
+        return [costs[product_id] for product_id in product_ids]
+
+    def _calculate(self, product_ids: list[int]) -> list[ProductCost]:
+        components = list(
+            ProductComponent.objects.filter(product_id__in=product_ids).values_list(
+                'product_id', 'content_type_id', 'object_id', 'unit_id', 'quantity'
+            )
+        )
+        unit_prices = self._get_unit_prices(components)
+
+        totals = dict.fromkeys(product_ids, Decimal(0))
+        incomplete = set()
+        for product_id, content_type_id, object_id, unit_id, quantity in components:
+            unit_price = unit_prices.get((content_type_id, object_id))
+            object_quantity = unit_converter.convert(quantity, unit_id, unit_price[0]) if unit_price else None
+            if object_quantity is None or unit_price[1] is None:
+                incomplete.add(product_id)
+                continue
+            totals[product_id] += object_quantity * unit_price[1]
+
+        return [
+            ProductCost(product_id=product_id, cost=total, is_complete=product_id not in incomplete)
+            for product_id, total in totals.items()
+        ]
+
+    @staticmethod
+    def _get_unit_prices(components: list[tuple]) -> dict[tuple[int, int], tuple[int, Decimal | None]]:
+        """Ед. измерения и цена за единицу объектов компонентов по ключу (content_type_id, object_id)."""
+        material_type = ContentType.objects.get_for_model(Material)
+        resource_type = ContentType.objects.get_for_model(Resource)
+
+        ids_by_type = defaultdict(set)
+        for _product_id, content_type_id, object_id, _unit_id, _quantity in components:
+            ids_by_type[content_type_id].add(object_id)
+
+        unit_prices = {}
+        if ids_by_type[material_type.id]:
+            for object_id, unit_id, price in Material.objects.filter(id__in=ids_by_type[material_type.id]).values_list(
+                'id', 'unit_id', 'price'
+            ):
+                unit_prices[(material_type.id, object_id)] = (unit_id, price)
+        if ids_by_type[resource_type.id]:
+            resources = Resource.objects.filter(id__in=ids_by_type[resource_type.id]).only(
+                'id', 'unit_id', 'is_depreciation', 'price', 'initial_price', 'service_life'
+            )
+            for resource in resources:
+                unit_prices[(resource_type.id, resource.id)] = (resource.unit_id, resource.get_unit_price())
+        return unit_prices
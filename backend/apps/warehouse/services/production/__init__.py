@@ -0,0 +1,8 @@
+from apps.warehouse.services.production.capacity import ProductCapacity, ProductCapacityService
+from apps.warehouse.services.production.service import ProductionService
+
+__all__ = [
+    'ProductCapacity',
+    'ProductCapacityService',
+    'ProductionService',
+]
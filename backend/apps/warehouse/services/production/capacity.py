@@ -0,0 +1,85 @@
+import dataclasses
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+
+from apps.unit.converter import unit_converter
+from apps.warehouse.models import Material, Product, ProductComponent, Warehouse
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ProductCapacity:
+    """Сколько единиц продукта можно произвести из остатков материалов."""
+
+    product_id: int
+    # None, если в составе нет материалов и выпуск остатками не ограничен
+    capacity: int | None
+    limiting_component_id: int | None = None
+    limiting_material_id: int | None = None
+
+
+@dataclasses.dataclass
+class ProductCapacityService:
+    """Производственная мощность продуктов склада по остаткам материалов.
+
+    Для каждого материального компонента остаток материала переводится в ед. измерений компонента
+    через коэффициенты и делится на количество компонента в составе. Мощность продукта - минимум
+    по компонентам, ограничивающий компонент - тот, на котором минимум достигается. Ресурсы
+    не расходуются и мощность не ограничивают.
+
+    Расчет выполняется за два запроса (состав всех продуктов и остатки их материалов) и один проход
+    по строкам состава, без запросов на продукт.
+    """
+
+    warehouse: Warehouse
+
+    def calculate(self) -> list[ProductCapacity]:
+        product_ids = list(Product.objects.filter(warehouse=self.warehouse).values_list('id', flat=True))
+        components = list(
+            ProductComponent.objects.filter(
+                product_id__in=product_ids,
+                content_type=ContentType.objects.get_for_model(Material),
+            ).values_list('id', 'product_id', 'object_id', 'unit_id', 'quantity')
+        )
+        materials = {
+            material_id: (unit_id, remaining)
+            for material_id, unit_id, remaining in Material.objects.filter(
+                id__in={object_id for _id, _product_id, object_id, _unit_id, _quantity in components}
+            ).values_list('id', 'unit_id', 'remaining')
+        }
+
+        # product_id -> (мощность, id компонента, id материала)
+        limits: dict[int, tuple[int, int, int]] = {}
+        for component_id, product_id, material_id, unit_id, quantity in components:
+            capacity = self._get_component_capacity(materials.get(material_id), unit_id, quantity)
+            if product_id not in limits or capacity < limits[product_id][0]:
+                limits[product_id] = (capacity, component_id, material_id)
+
+        capacities = []
+        for product_id in product_ids:
+            if product_id not in limits:
+                capacities.append(ProductCapacity(product_id=product_id, capacity=None))
+                continue
+            capacity, component_id, material_id = limits[product_id]
+            capacities.append(
+                ProductCapacity(
+                    product_id=product_id,
+                    capacity=capacity,
+                    limiting_component_id=component_id,
+                    limiting_material_id=material_id,
+                )
+            )
+        return capacities
+
+    @staticmethod
+    def _get_component_capacity(material: tuple[int, Decimal] | None, unit_id: int, quantity: Decimal) -> int:
+        """Сколько единиц продукта обеспечивает остаток материала компонента."""
+        if material is None or quantity <= 0:
+            return 0
+        material_unit_id, remaining = material
+        ratio = unit_converter.get_ratio(material_unit_id, unit_id)
+        if ratio is None or remaining <= 0:
+            return 0
+        numerator, denominator = ratio
+        # Целочисленное деление точное: округленный перевод мог бы дать 0.9999... вместо целого выпуска
+        return int(remaining * numerator // (denominator * quantity))
@@ -0,0 +1,125 @@
+import dataclasses
+from decimal import ROUND_UP, Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.common.cache import owner_cache_version
+from apps.unit.converter import unit_converter
+from apps.users.models import User
+from apps.warehouse.choices import StockMovementReasonChoices
+from apps.warehouse.models import Material, Product, ProductComponent, StockMovement
+from apps.warehouse.services.stock import REMAINING_MAX, update_remaining
+
+
+@dataclasses.dataclass
+class ProductionService:
+    """Производство партии продукта: списание материалов состава и приход продукта в одной транзакции.
+
+    Расход материала - количество компонента, умноженное на размер партии и переведенное в ед. измерений
+    материала с округлением вверх до точности остатка; нулевой расход не списывается и не пишется
+    в журнал. Материалы блокируются одним SELECT ... FOR UPDATE в порядке id, затем блокируется продукт,
+    поэтому параллельные операции с общими материалами выполняются по очереди без взаимных блокировок.
+    Остатки материалов и продукта меняются двумя UPDATE с CASE, журнал пишется одним bulk_create:
+    число запросов не зависит от размера состава.
+    """
+
+    product: Product
+    quantity: Decimal
+    user: User | None = None
+    comment: str = ''
+
+    # Точность поля remaining
+    REMAINING_EXPONENT = Decimal('0.0001')
+
+    def produce(self) -> list[StockMovement]:
+        with transaction.atomic():
+            components = list(
+                ProductComponent.objects.filter(
+                    product=self.product,
+                    content_type=ContentType.objects.get_for_model(Material),
+                ).values_list('id', 'object_id', 'unit_id', 'quantity')
+            )
+            materials = {
+                material_id: (warehouse_id, unit_id, remaining)
+                for material_id, warehouse_id, unit_id, remaining in Material.objects.select_for_update()
+                .filter(
+                    id__in={object_id for _id, object_id, _unit_id, _quantity in components},
+                    warehouse__user_id=self.product.warehouse.user_id,
+                )
+                .order_by('id')
+                .values_list('id', 'warehouse_id', 'unit_id', 'remaining')
+            }
+            product_remaining = (
+                Product.objects.select_for_update().filter(id=self.product.id).values_list('remaining', flat=True).get()
+            )
+
+            consumption = self._get_consumption(components, materials)
+            if product_remaining + self.quantity > REMAINING_MAX:
+                raise serializers.ValidationError({'quantity': _('Превышен максимальный остаток продукта')})
+
+            if consumption:
+                update_remaining(Material, {material_id: -amount for material_id, amount in consumption.items()})
+            update_remaining(Product, {self.product.id: self.quantity})
+
+            material_type = ContentType.objects.get_for_model(Material)
+            movements = [
+                StockMovement(
+                    warehouse_id=materials[material_id][0],
+                    content_type=material_type,
+                    object_id=material_id,
+                    delta=-amount,
+                    remaining=materials[material_id][2] - amount,
+                    reason=StockMovementReasonChoices.PRODUCTION,
+                    comment=self.comment,
+                    created_by=self.user,
+                )
+                for material_id, amount in consumption.items()
+            ]
+            movements.append(
+                StockMovement(
+                    warehouse_id=self.product.warehouse_id,
+                    content_type=ContentType.objects.get_for_model(Product),
+                    object_id=self.product.id,
+                    delta=self.quantity,
+                    remaining=product_remaining + self.quantity,
+                    reason=StockMovementReasonChoices.PRODUCTION,
+                    comment=self.comment,
+                    created_by=self.user,
+                )
+            )
+            StockMovement.objects.bulk_create(movements)
+            # UPDATE и bulk_create не отправляют сигналы, версию данных владельца повышаем явно
+            owner_cache_version.bump_on_commit(self.product.warehouse.user_id)
+
+        return movements
+
+    def _get_consumption(self, components: list[tuple], materials: dict[int, tuple]) -> dict[int, Decimal]:
+        """Расход материалов на партию в их ед. измерений, ошибки указываются по id компонента."""
+        consumption: dict[int, Decimal] = {}
+        errors = {}
+        for component_id, material_id, unit_id, quantity in components:
+            if material_id not in materials:
+                errors[component_id] = _('Материал компонента не найден')
+                continue
+            _warehouse_id, material_unit_id, _remaining = materials[material_id]
+            amount = unit_converter.convert(quantity * self.quantity, unit_id, material_unit_id)
+            if amount is None:
+                errors[component_id] = _('Ед. измерений компонента не переводится в ед. измерений материала')
+                continue
+            # Округление вверх: расход меньше точности остатка не списывается в ноль
+            amount = amount.quantize(self.REMAINING_EXPONENT, rounding=ROUND_UP)
+            if amount:
+                consumption[material_id] = consumption.get(material_id, Decimal(0)) + amount
+
+        component_ids = {material_id: component_id for component_id, material_id, _unit_id, _quantity in components}
+        for material_id, amount in consumption.items():
+            available = materials[material_id][2]
+            if amount > available:
+                errors[component_ids[material_id]] = _('Недостаточно остатка материала, доступно: ') + str(available)
+
+        if errors:
+            raise serializers.ValidationError({'components': dict(sorted(errors.items()))})
+        return consumption
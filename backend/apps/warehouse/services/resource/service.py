@@ -3,15 +3,14 @@ from decimal import Decimal
 from functools import cached_property
 
 from django.db import transaction
-from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from apps.unit.models import Unit
 from apps.users.models import User
 from apps.warehouse.choices import CategoryTypeChoices
-from apps.warehouse.models import Category, Resource
-from apps.warehouse.validators.category import category_type_validate, user_category_validate
+from apps.warehouse.models import Resource
+from apps.warehouse.validators.category import CategoryValidator
 
 
 @dataclasses.dataclass
@@ -55,7 +54,7 @@ class ResourceService:
                 updated_by=self.user,
             )
 
-            resource.categories.set(self.categories_qs)
+            resource.categories.set(self.category_validator.categories)
 
         return resource
 
@@ -73,7 +72,7 @@ class ResourceService:
             resource.updated_by = self.user
 
             resource.save()
-            resource.categories.set(self.categories_qs)
+            resource.categories.set(self.category_validator.categories)
 
         return resource
 
@@ -85,14 +84,12 @@ class ResourceService:
         elif not self.is_depreciation and self.price is None:
             raise serializers.ValidationError({'price': _('Необходимо передать стоимость')})
 
-        if self.categories_qs:
-            user_category_validate(categories=self.categories_qs, user=self.user)
-
-            category_type_validate(
-                categories=self.categories_qs,
-                category_type=CategoryTypeChoices.RESOURCE,
-            )
+        self.category_validator.validate()
 
     @cached_property
-    def categories_qs(self) -> QuerySet[Category]:
-        return Category.objects.filter(id__in=self.categories_id)
+    def category_validator(self) -> CategoryValidator:
+        return CategoryValidator(
+            categories_id=self.categories_id,
+            category_type=CategoryTypeChoices.RESOURCE,
+            user=self.user,
+        )
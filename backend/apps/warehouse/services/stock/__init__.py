@@ -0,0 +1,9 @@
+from apps.warehouse.services.stock.low_stock import LowStockService
+from apps.warehouse.services.stock.service import REMAINING_MAX, StockAdjustmentService, update_remaining
+
+__all__ = [
+    'REMAINING_MAX',
+    'LowStockService',
+    'StockAdjustmentService',
+    'update_remaining',
+]
@@ -0,0 +1,36 @@
+import dataclasses
+
+from django.db.models import CharField, DecimalField, ExpressionWrapper, F, QuerySet, Value
+
+from apps.warehouse.choices import StorageTypeChoices
+from apps.warehouse.models import Material, Product
+
+
+@dataclasses.dataclass
+class LowStockService:
+    """Материалы и продукты складов пользователя с остатком ниже минимального.
+
+    Условие remaining < min_remaining совпадает с условием частичных индексов low_stock,
+    поэтому выборка читает только строки с нехваткой, а не все остатки складов.
+    """
+
+    user_id: int
+
+    def get_queryset(self) -> QuerySet:
+        materials = self._get_entity_queryset(Material, StorageTypeChoices.MATERIAL)
+        products = self._get_entity_queryset(Product, StorageTypeChoices.PRODUCT)
+        return materials.union(products, all=True).order_by('warehouse_id', 'entity_type', 'id')
+
+    def _get_entity_queryset(self, model: type[Material | Product], entity_type: str) -> QuerySet:
+        return (
+            model.objects.filter(warehouse__user_id=self.user_id, remaining__lt=F('min_remaining'))
+            .order_by()
+            .annotate(
+                entity_type=Value(entity_type, output_field=CharField()),
+                shortage=ExpressionWrapper(
+                    F('min_remaining') - F('remaining'),
+                    output_field=DecimalField(max_digits=12, decimal_places=4),
+                ),
+            )
+            .values('entity_type', 'id', 'warehouse_id', 'title', 'remaining', 'min_remaining', 'shortage')
+        )
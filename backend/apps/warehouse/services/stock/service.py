@@ -0,0 +1,111 @@
+import dataclasses
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from apps.common.cache import owner_cache_version
+from apps.users.models import User
+from apps.warehouse.choices import StorageTypeChoices
+from apps.warehouse.models import Material, Product, StockMovement, Warehouse
+from apps.warehouse.services.dto import StockAdjustmentDTO
+
+# Максимальный остаток, который помещается в поле remaining (max_digits=12, decimal_places=4)
+REMAINING_MAX = Decimal('99999999.9999')
+
+
+def update_remaining(model: type[Material | Product], deltas: dict[int, Decimal]) -> None:
+    """Изменяет остатки объектов одним UPDATE с CASE по id относительно текущего значения."""
+    model.objects.filter(id__in=deltas).update(
+        remaining=F('remaining')
+        + Case(
+            *[When(id=entity_id, then=Value(delta)) for entity_id, delta in deltas.items()],
+            output_field=DecimalField(max_digits=12, decimal_places=4),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+@dataclasses.dataclass
+class StockAdjustmentService:
+    """Атомарное изменение остатков материалов или продуктов склада с записью в журнал движений.
+
+    Изменения одного объекта суммируются, строки блокируются одним SELECT ... FOR UPDATE в порядке id,
+    поэтому параллельные пакеты не теряют изменения и не блокируют друг друга взаимно. Остатки
+    обновляются одним UPDATE с CASE по id относительно текущего значения, журнал пишется bulk_create.
+    Блокировки держатся только до конца транзакции пакета.
+    """
+
+    warehouse: Warehouse
+    adjustments: list[StockAdjustmentDTO]
+    user: User | None = None
+
+    @property
+    def model(self) -> type[Material | Product]:
+        return Material if self.warehouse.storage_type == StorageTypeChoices.MATERIAL else Product
+
+    def apply(self) -> list[StockMovement]:
+        if not self.adjustments:
+            raise serializers.ValidationError({'adjustments': _('Передайте хотя бы одно изменение остатка')})
+
+        deltas: dict[int, Decimal] = {}
+        for adjustment in self.adjustments:
+            deltas[adjustment.entity_id] = deltas.get(adjustment.entity_id, Decimal(0)) + adjustment.delta
+
+        with transaction.atomic():
+            remaining = dict(
+                self.model.objects.select_for_update()
+                .filter(warehouse=self.warehouse, id__in=deltas)
+                .order_by('id')
+                .values_list('id', 'remaining')
+            )
+            self._validate(deltas, remaining)
+
+            update_remaining(self.model, deltas)
+
+            content_type = ContentType.objects.get_for_model(self.model)
+            movements = []
+            for adjustment in self.adjustments:
+                remaining[adjustment.entity_id] += adjustment.delta
+                movements.append(
+                    StockMovement(
+                        warehouse=self.warehouse,
+                        content_type=content_type,
+                        object_id=adjustment.entity_id,
+                        delta=adjustment.delta,
+                        remaining=remaining[adjustment.entity_id],
+                        reason=adjustment.reason,
+                        comment=adjustment.comment,
+                        created_by=self.user,
+                    )
+                )
+            StockMovement.objects.bulk_create(movements)
+            # UPDATE и bulk_create не отправляют сигналы, версию данных владельца повышаем явно
+            owner_cache_version.bump_on_commit(self.warehouse.user_id)
+
+        return movements
+
+    def _validate(self, deltas: dict[int, Decimal], remaining: dict[int, Decimal]) -> None:
+        # Ошибка остатка объекта указывается у его последнего изменения
+        last_index = {adjustment.entity_id: i for i, adjustment in enumerate(self.adjustments)}
+
+        errors = {}
+        for entity_id, delta in deltas.items():
+            if entity_id not in remaining:
+                errors[last_index[entity_id]] = {'entity_id': _('Объект склада не найден')}
+                continue
+
+            result = remaining[entity_id] + delta
+            if result < 0:
+                errors[last_index[entity_id]] = {
+                    'delta': _('Недостаточно остатка, доступно: ') + str(remaining[entity_id])
+                }
+            elif result > REMAINING_MAX:
+                errors[last_index[entity_id]] = {'delta': _('Превышен максимальный остаток')}
+
+        if errors:
+            raise serializers.ValidationError({'adjustments': dict(sorted(errors.items()))})
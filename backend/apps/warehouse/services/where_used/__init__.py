@@ -0,0 +1,5 @@
+from apps.warehouse.services.where_used.service import WhereUsedService
+
+__all__ = [
+    'WhereUsedService',
+]
@@ -0,0 +1,48 @@
+import dataclasses
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+
+from apps.unit.converter import unit_converter
+from apps.warehouse.models import Material, ProductComponent, Resource
+
+
+@dataclasses.dataclass
+class WhereUsedService:
+    """Продукты, в состав которых входят материалы или ресурсы.
+
+    Компоненты вместе с продуктами выбираются одним запросом по индексу (content_type, object_id),
+    количество компонента переводится в ед. измерений материала/ресурса по каталогу без запросов.
+    Компонентами продукта могут быть только материалы и ресурсы, поэтому обход в глубину не нужен.
+    """
+
+    model: type[Material | Resource]
+    objects: list[Material | Resource]
+
+    def get_usages(self) -> list[dict]:
+        units = {obj.id: obj.unit_id for obj in self.objects}
+        if not units:
+            return []
+
+        usages = list(
+            ProductComponent.objects.filter(
+                content_type=ContentType.objects.get_for_model(self.model),
+                object_id__in=units,
+            )
+            .order_by('object_id', 'product_id', 'id')
+            .values(
+                'object_id',
+                'product_id',
+                component_id=F('id'),
+                product_title=F('product__title'),
+                warehouse_id=F('product__warehouse_id'),
+                component_quantity=F('quantity'),
+                component_unit_id=F('unit_id'),
+            )
+        )
+        for usage in usages:
+            usage['unit_id'] = units[usage['object_id']]
+            usage['quantity'] = unit_converter.convert(
+                usage['component_quantity'], usage['component_unit_id'], usage['unit_id']
+            )
+        return usages
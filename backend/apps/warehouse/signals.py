@@ -0,0 +1,82 @@
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.common.cache import owner_cache_version
+from apps.warehouse.models import Category, FileAttachment, Material, Product, ProductComponent, Resource, Warehouse
+from apps.warehouse.services.product_cost import product_cost_cache
+
+
+def get_owner_id(instance: Model) -> int | None:
+    """Возвращает id владельца объекта по owner_lookup модели.
+
+    Загруженные связи используются без запросов, недостающая часть пути запрашивается одним values_list.
+    """
+    obj = instance
+    parts = instance.owner_lookup.split('__')
+    for i, part in enumerate(parts):
+        field = obj._meta.get_field(part)
+        if i == len(parts) - 1:
+            return getattr(obj, field.attname)
+        if not field.is_cached(obj):
+            rest = '__'.join(parts[i + 1 :])
+            return (
+                field.related_model.objects.filter(pk=getattr(obj, field.attname)).values_list(rest, flat=True).first()
+            )
+        obj = getattr(obj, part)
+    return None
+
+
+@receiver(post_save, sender=Warehouse)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductComponent)
+@receiver(post_save, sender=Resource)
+@receiver(post_save, sender=FileAttachment)
+def bump_owner_cache_version_on_save(sender: type[Model], instance: Model, **kwargs: Any) -> None:
+    """Сбрасывает закэшированные ответы владельца при изменении объекта."""
+    owner_cache_version.bump_on_commit(get_owner_id(instance))
+
+
+@receiver(pre_delete, sender=Warehouse)
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Material)
+@receiver(pre_delete, sender=Product)
+@receiver(pre_delete, sender=ProductComponent)
+@receiver(pre_delete, sender=Resource)
+@receiver(pre_delete, sender=FileAttachment)
+def bump_owner_cache_version_on_delete(
+    sender: type[Model], instance: Model, origin: Model | Any = None, **kwargs: Any
+) -> None:
+    """Сбрасывает закэшированные ответы владельца при удалении объекта.
+
+    Владелец определяется до удаления, пока связи еще существуют. При каскадном удалении
+    версия повышается только для объекта, с которого удаление началось.
+    """
+    if isinstance(origin, Model) and origin is not instance:
+        return
+    owner_cache_version.bump_on_commit(get_owner_id(instance))
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=Resource)
+@receiver(pre_delete, sender=Material)
+@receiver(pre_delete, sender=Resource)
+def invalidate_component_products_cost(
+    sender: type[Material | Resource], instance: Material | Resource, created: bool = False, **kwargs: Any
+) -> None:
+    """Сбрасывает себестоимость продуктов, в состав которых входит материал или ресурс."""
+    if created:
+        # Новый объект еще не входит в состав продуктов
+        return
+    product_cost_cache.invalidate_component(sender, instance.id)
+
+
+@receiver(post_save, sender=ProductComponent)
+@receiver(pre_delete, sender=ProductComponent)
+def invalidate_product_cost(sender: type[ProductComponent], instance: ProductComponent, **kwargs: Any) -> None:
+    """Сбрасывает себестоимость продукта при изменении его состава."""
+    product_cost_cache.invalidate_on_commit([instance.product_id])
@@ -1,4 +1,7 @@
-from django.db.models import QuerySet
+import dataclasses
+from functools import cached_property
+
+from django.db.models import Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
@@ -6,47 +9,67 @@ from apps.users.models import User
 from apps.warehouse.models import Category, Warehouse
 
 
-def warehouse_category_and_entity_validate(
-    warehouse: Warehouse,
-    entity_categories: QuerySet[Category],
-) -> None:
-    warehouse_categories = warehouse.categories.values_list('id', flat=True)
-    wrong_categories = entity_categories.exclude(id__in=warehouse_categories).values_list(
-        'title',
-        flat=True,
-    )
-    if wrong_categories:
-        warehouse_categories_titles = ', '.join(wrong_categories)
-        raise serializers.ValidationError(
-            {'categories': _('Исключите категории не принадлежащие складу: ') + warehouse_categories_titles}
-        )
-
-
-def category_type_validate(
-    categories: QuerySet[Category],
-    category_type: str,
-) -> None:
-    categories_another_type = categories.exclude(category_type=category_type)
-    if categories_another_type.count() > 0:
-        categories_titles = ', '.join(categories_another_type.values_list('title', flat=True))
-        raise serializers.ValidationError(
-            {
-                'categories': _('Категории не соответствуют допустимым типам: ') + categories_titles,
-            },
-        )
-
-
-def user_category_validate(
-    categories: QuerySet[Category],
-    user: User,
-) -> None:
-    user_categories = Category.objects.filter(user=user).values_list('id', flat=True)
-    wrong_categories = categories.exclude(id__in=user_categories).values_list(
-        'title',
-        flat=True,
-    )
-    if wrong_categories:
-        user_categories_titles = ', '.join(wrong_categories)
-        raise serializers.ValidationError(
-            {'categories': _('Исключите категории не принадлежащие пользователю: ') + user_categories_titles}
-        )
+@dataclasses.dataclass
+class CategoryValidator:
+    """Проверка категорий, назначаемых сущности склада.
+
+    Запрошенные категории загружаются одним запросом вместе с признаком принадлежности складу,
+    после чего правила проверяются в памяти:
+        - категория принадлежит складу (если передан warehouse);
+        - категория принадлежит пользователю (если передан user);
+        - тип категории совпадает с category_type.
+    """
+
+    categories_id: list[int]
+    category_type: str
+    warehouse: Warehouse | None = None
+    user: User | None = None
+
+    @cached_property
+    def categories(self) -> list[Category]:
+        if not self.categories_id:
+            return []
+
+        queryset = Category.objects.filter(id__in=self.categories_id)
+        if self.warehouse is not None:
+            queryset = queryset.annotate(
+                in_warehouse=Exists(
+                    Warehouse.categories.through.objects.filter(
+                        warehouse_id=self.warehouse.id,
+                        category_id=OuterRef('pk'),
+                    )
+                )
+            )
+        return list(queryset)
+
+    def validate(self) -> list[Category]:
+        """Проверяет категории и возвращает их для назначения сущности."""
+        error = self.get_error()
+        if error is not None:
+            raise serializers.ValidationError(error)
+        return self.categories
+
+    def get_error(self, categories: list[Category] | None = None) -> dict | None:
+        """Возвращает ошибку для категорий (по умолчанию для всех запрошенных) или None.
+
+        Подмножество категорий позволяет проверять много сущностей по одной загрузке категорий.
+        """
+        categories = self.categories if categories is None else categories
+
+        if self.warehouse is not None:
+            wrong_categories = [category.title for category in categories if not category.in_warehouse]
+            if wrong_categories:
+                return {'categories': _('Исключите категории не принадлежащие складу: ') + ', '.join(wrong_categories)}
+
+        if self.user is not None:
+            wrong_categories = [category.title for category in categories if category.user_id != self.user.id]
+            if wrong_categories:
+                return {
+                    'categories': _('Исключите категории не принадлежащие пользователю: ') + ', '.join(wrong_categories)
+                }
+
+        wrong_categories = [category.title for category in categories if category.category_type != self.category_type]
+        if wrong_categories:
+            return {'categories': _('Категории не соответствуют допустимым типам: ') + ', '.join(wrong_categories)}
+
+        return None
@@ -0,0 +1,78 @@
+"""Сравнение JSONRenderer/JSONParser DRF и ORJSONRenderer/ORJSONParser на страницах списка продуктов.
+
+Запуск из каталога backend (в контейнере wh-backend):
+    python -m benchmarks.json_renderer --rows 100 --number 2000
+"""
+
+import argparse
+import io
+import os
+import timeit
+from decimal import Decimal
+from typing import Callable
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.settings')
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.common.parsers import ORJSONParser  # noqa: E402
+from api.common.renderers import ORJSONRenderer  # noqa: E402
+
+
+def product_list_page(rows: int) -> dict:
+    """Страница /products/ в том виде, в каком ее возвращает ProductListSerializer."""
+    return {
+        'count': rows * 10,
+        'next': 'http://localhost/api/v1/warehouse/1/products/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': index,
+                'warehouse': 1,
+                'categories': [
+                    {'id': 1, 'title': 'Готовая продукция', 'category_type': 'product'},
+                    {'id': 2, 'title': 'Сезонное', 'category_type': 'product'},
+                ],
+                'unit': {'id': 3, 'title': 'Килограммы', 'short_title': 'кг'},
+                'title': f'Продукт {index}',
+                'price': f'{Decimal(index) * Decimal("12.35"):.2f}',
+                'notes': 'Заметка о продукте',
+                'remaining': f'{Decimal(index) / Decimal(7):.4f}',
+                'min_remaining': None if index % 3 else '1.5000',
+                'sku': f'SKU-{index:06d}',
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+def measure(label: str, func: Callable[[], object], number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f'{label:<28}{seconds * 1_000_000:>10.1f} мкс')
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100, help='Количество продуктов на странице')
+    parser.add_argument('--number', type=int, default=1000, help='Количество повторов замера')
+    args = parser.parse_args()
+
+    page = product_list_page(args.rows)
+    content = JSONRenderer().render(page)
+    assert ORJSONRenderer().render(page) == content
+
+    print(f'Страница /products/: {args.rows} строк, {len(content)} байт')
+    drf_render = measure('JSONRenderer.render', lambda: JSONRenderer().render(page), args.number)
+    orjson_render = measure('ORJSONRenderer.render', lambda: ORJSONRenderer().render(page), args.number)
+    drf_parse = measure('JSONParser.parse', lambda: JSONParser().parse(io.BytesIO(content)), args.number)
+    orjson_parse = measure('ORJSONParser.parse', lambda: ORJSONParser().parse(io.BytesIO(content)), args.number)
+    print(f'Ускорение рендера: x{drf_render / orjson_render:.1f}, парсинга: x{drf_parse / orjson_parse:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -118,6 +118,14 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Загрузки больше FILE_UPLOAD_MAX_MEMORY_SIZE пишутся во временный файл и перемещаются в хранилище без чтения в память
+FILE_ATTACHMENT_MAX_SIZE = env.int('FILE_ATTACHMENT_MAX_SIZE', default=500 * 1024 * 1024)
+# python - файл отдает Django, x-accel - nginx по заголовку X-Accel-Redirect (см. cicd/nginx/nginx.conf)
+FILE_ATTACHMENT_DOWNLOAD_MODE = env.str('FILE_ATTACHMENT_DOWNLOAD_MODE', default='python')
+FILE_ATTACHMENT_ACCEL_REDIRECT_LOCATION = env.str(
+    'FILE_ATTACHMENT_ACCEL_REDIRECT_LOCATION', default='/protected-media/'
+)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
@@ -129,6 +137,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.common.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_SCHEMA_CLASS': 'api.common.spectacular_schema.RequestResponseAutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -202,6 +219,19 @@ CACHES = {
     },
 }
 
+UNIT_CATALOGUE_CACHE_ALIAS = 'redis-cache'
+RESPONSE_CACHE_ALIAS = 'redis-cache'
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+PRODUCT_COST_CACHE_ALIAS = 'redis-cache'
+PRODUCT_COST_CACHE_TIMEOUT = env.int('PRODUCT_COST_CACHE_TIMEOUT', default=60 * 60 * 24)
+UNIT_CATALOGUE_VERSION_CHECK_INTERVAL = env.int('UNIT_CATALOGUE_VERSION_CHECK_INTERVAL', default=5)
+UNIT_CONVERT_MAX_ITEMS = env.int('UNIT_CONVERT_MAX_ITEMS', default=1000)
+
+MATERIAL_IMPORT_MAX_ROWS = env.int('MATERIAL_IMPORT_MAX_ROWS', default=50000)
+
+STOCK_ADJUSTMENT_MAX_ITEMS = env.int('STOCK_ADJUSTMENT_MAX_ITEMS', default=1000)
+
+WHERE_USED_MAX_ITEMS = env.int('WHERE_USED_MAX_ITEMS', default=1000)
 
 SPECTACULAR_SETTINGS = {
     'SWAGGER_UI_DIST': 'SIDECAR',
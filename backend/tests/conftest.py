@@ -43,6 +43,18 @@ def auth_api_test_client(auth_user):
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches(settings, request):
+    """Изолирует кэши каждого теста, чтобы версии и закэшированные данные не переживали тест."""
+    settings.CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'{alias}:{request.node.nodeid}',
+        }
+        for alias in settings.CACHES
+    }
+
+
 @pytest.fixture(scope='session', autouse=True)
 def temporary_media_root():
     # Создаем временную папку для MEDIA_ROOT
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework import status
+
+from apps.unit.converter import unit_converter
+from apps.unit.models import Unit, UnitGroup
+
+
+@pytest.fixture
+def unit_group():
+    return UnitGroup.objects.create()
+
+
+@pytest.fixture
+def unit(unit_group):
+    return Unit.objects.create(group=unit_group, coefficient=Decimal('1.0'))
+
+
+@pytest.fixture
+def unit_centimeter(unit_group):
+    return Unit.objects.create(group=unit_group, coefficient=Decimal('0.01'))
+
+
+@pytest.fixture
+def unit_another_group():
+    return Unit.objects.create(group=UnitGroup.objects.create(), coefficient=Decimal('1.0'))
+
+
+@pytest.mark.django_db
+class TestUnitConvert:
+    BASE_URL = '/api/v1/units/convert/'
+
+    def test_convert(self, auth_api_test_client, unit, unit_centimeter):
+        """Тест пакетного перевода количеств внутри группы."""
+        data = {
+            'items': [
+                {'value': '2.5', 'from_unit': unit.id, 'to_unit': unit_centimeter.id},
+                {'value': '30', 'from_unit': unit_centimeter.id, 'to_unit': unit.id},
+                {'value': '7', 'from_unit': unit.id, 'to_unit': unit.id},
+            ]
+        }
+
+        response = auth_api_test_client.post(self.BASE_URL, data=data, expected_status=status.HTTP_200_OK)
+
+        assert [item['result'] for item in response] == ['250.000000', '0.300000', '7.000000']
+
+    def test_convert_errors(self, auth_api_test_client, unit, unit_another_group):
+        """Тест ошибок перевода между группами и для несуществующих ед. измерений."""
+        data = {
+            'items': [
+                {'value': '1', 'from_unit': unit.id, 'to_unit': unit.id},
+                {'value': '1', 'from_unit': unit.id, 'to_unit': unit_another_group.id},
+                {'value': '1', 'from_unit': unit.id + unit_another_group.id, 'to_unit': unit.id},
+            ]
+        }
+
+        response = auth_api_test_client.post(self.BASE_URL, data=data, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert set(response['items']) == {'1', '2'}
+        assert 'to_unit' in response['items']['1']
+        assert 'from_unit' in response['items']['2']
+
+    def test_converter_picks_up_new_unit(self, unit, unit_centimeter):
+        """Тест перестроения матрицы коэффициентов для ед. измерений, добавленной после загрузки каталога."""
+        assert unit_converter.convert_many([Decimal('1'), Decimal('0.5')], unit.id, unit_centimeter.id) == [
+            Decimal('100'),
+            Decimal('50'),
+        ]
+
+        unit_millimeter = Unit.objects.create(group=unit.group, coefficient=Decimal('0.001'))
+
+        assert unit_converter.convert(Decimal('3'), unit_centimeter.id, unit_millimeter.id) == Decimal('30')
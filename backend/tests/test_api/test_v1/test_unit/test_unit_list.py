@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.unit.catalogue import unit_catalogue
+from apps.unit.models import Unit, UnitGroup, UnitGroupTranslation, UnitTranslation
+
+
+@pytest.fixture
+def unit_group():
+    group = UnitGroup.objects.create()
+    UnitGroupTranslation.objects.create(group=group, language_code='ru', title='Длина')
+    UnitGroupTranslation.objects.create(group=group, language_code='en', title='Length')
+    return group
+
+
+@pytest.fixture
+def unit(unit_group):
+    unit = Unit.objects.create(group=unit_group, coefficient=Decimal('1.0'))
+    UnitTranslation.objects.create(unit=unit, language_code='ru', title='Метры', short_title='м')
+    UnitTranslation.objects.create(unit=unit, language_code='en', title='Meters', short_title='m')
+    return unit
+
+
+@pytest.mark.django_db
+class TestUnitList:
+    BASE_URL = '/api/v1/units/'
+
+    def test_get_unit_list(self, auth_api_test_client, unit):
+        """Тест получения списка ед. измерений."""
+        response = auth_api_test_client.get(self.BASE_URL)
+
+        data = response['results']
+        assert data[0]['id'] == unit.id
+        assert data[0]['title'] == 'Метры'
+        assert data[0]['short_title'] == 'м'
+        assert data[0]['group']['title'] == 'Длина'
+
+    def test_get_unit_list_fallback_language(self, auth_api_test_client, unit):
+        """Тест получения перевода на запасном языке."""
+        response = auth_api_test_client.get(self.BASE_URL, HTTP_ACCEPT_LANGUAGE='en')
+
+        assert response['results'][0]['title'] == 'Meters'
+        assert response['results'][0]['group']['title'] == 'Length'
+
+    def test_translations_are_served_from_catalogue(self, auth_api_test_client, unit):
+        """Тест того что переводы не запрашиваются из БД повторно."""
+        auth_api_test_client.get(self.BASE_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_api_test_client.get(self.BASE_URL)
+
+        assert not any('unit_unittranslation' in query['sql'] for query in queries)
+
+    def test_get_unit_list_cached(self, auth_api_test_client, unit):
+        """Тест того что повторный запрос списка отдается из кэша без запросов к справочнику."""
+        auth_api_test_client.get(self.BASE_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_api_test_client.get(self.BASE_URL)
+
+        assert response['results'][0]['id'] == unit.id
+        assert not any('unit_unit' in query['sql'] for query in queries.captured_queries)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_catalogue_invalidated_on_change(self, auth_api_test_client, unit):
+        """Тест сброса каталога и закэшированного списка при изменении справочника."""
+        version = unit_catalogue.get_version()
+        auth_api_test_client.get(self.BASE_URL)
+
+        UnitTranslation.objects.filter(unit=unit, language_code='ru').update(title='Не сброшено')
+        translation = UnitTranslation.objects.get(unit=unit, language_code='ru')
+        translation.title = 'Метры (изм.)'
+        translation.save()
+
+        response = auth_api_test_client.get(self.BASE_URL)
+
+        assert unit_catalogue.get_version() > version
+        assert response['results'][0]['title'] == 'Метры (изм.)'
+
+    def test_unknown_unit_does_not_reload_catalogue(self, unit):
+        """Тест того что несуществующий id не перезагружает каталог при неизменной версии."""
+        unit_catalogue.get_unit(unit.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert unit_catalogue.get_unit(unit.id + 1000) is None
+            assert unit_catalogue.get_unit(unit.id + 1000) is None
+            assert unit_catalogue.get_group(unit.group_id + 1000) is None
+
+        assert not queries.captured_queries
+
+    def test_catalogue_version_bumped_once_per_transaction(self, django_capture_on_commit_callbacks):
+        """Тест того что построчное изменение справочника повышает версию один раз на транзакцию."""
+        version = unit_catalogue.get_version()
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            group = UnitGroup.objects.create()
+            for coefficient in ('0.1', '0.01', '0.001'):
+                Unit.objects.create(group=group, coefficient=Decimal(coefficient))
+
+            assert unit_catalogue.get_version() == version + 1
+            assert len(unit_catalogue.snapshot.get_group_units(group.id)) == 3
+
+        assert len(callbacks) == 1
+        assert unit_catalogue.get_version() == version + 2
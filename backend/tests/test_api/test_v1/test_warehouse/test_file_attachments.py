@@ -1,9 +1,13 @@
 import os
+from unittest import mock
 
 import pytest
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from apps.warehouse.choices import ContentTypeChoices
@@ -33,6 +37,68 @@ class TestFileAttachmentCRUD:
         assert attachment.content_type == ContentType.objects.get_for_model(Warehouse)
         assert attachment.object_id == warehouse.id
         assert os.path.basename(attachment.file.name) == 'test_file.txt'
+        assert attachment.owner_id == warehouse.user_id
+
+    def test_create_large_file_attachment(self, settings, auth_api_test_client, warehouse):
+        """Тест создания вложения, загруженного во временный файл."""
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 1024
+        content = os.urandom(64 * 1024)
+        data = {
+            'content_type': ContentTypeChoices.WAREHOUSE,
+            'object_id': warehouse.id,
+            'file': SimpleUploadedFile('large_file.bin', content),
+        }
+
+        response = auth_api_test_client.post(self.BASE_URL, data=data, format='multipart')
+
+        attachment = FileAttachment.objects.get(id=response['id'])
+        with attachment.file.open('rb') as file:
+            assert file.read() == content
+
+    def test_create_file_attachment_too_large(self, settings, auth_api_test_client, warehouse):
+        """Тест создания вложения больше допустимого размера."""
+        settings.FILE_ATTACHMENT_MAX_SIZE = 10
+        data = {
+            'content_type': ContentTypeChoices.WAREHOUSE,
+            'object_id': warehouse.id,
+            'file': SimpleUploadedFile('test_file.txt', b'file_content_too_large'),
+        }
+
+        response = auth_api_test_client.post(
+            self.BASE_URL,
+            data=data,
+            format='multipart',
+            expected_status=status.HTTP_400_BAD_REQUEST,
+        )
+
+        assert 'Размер файла превышает допустимый' in response['file']
+        assert not FileAttachment.objects.exists()
+
+    def test_create_file_attachment_too_large_not_read(self, settings, auth_api_test_client, warehouse):
+        """Тест того что загрузка больше допустимого размера прерывается при чтении, а не после сохранения."""
+        settings.FILE_ATTACHMENT_MAX_SIZE = TemporaryFileUploadHandler.chunk_size
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+        data = {
+            'content_type': ContentTypeChoices.WAREHOUSE,
+            'object_id': warehouse.id,
+            'file': SimpleUploadedFile('test_file.bin', b'0' * TemporaryFileUploadHandler.chunk_size * 16),
+        }
+
+        def write_chunk(handler: TemporaryFileUploadHandler, raw_data: bytes, start: int) -> None:
+            handler.file.write(raw_data)
+
+        with mock.patch.object(
+            TemporaryFileUploadHandler, 'receive_data_chunk', autospec=True, side_effect=write_chunk
+        ) as receive_data_chunk:
+            response = auth_api_test_client.post(
+                self.BASE_URL,
+                data=data,
+                format='multipart',
+                expected_status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assert 'Размер файла превышает допустимый' in response['file']
+        assert receive_data_chunk.call_count == 1
 
     def test_retrieve_file_attachment(self, auth_api_test_client, warehouse):
         """Тест получения скачиваемого файла."""
@@ -53,6 +119,54 @@ class TestFileAttachmentCRUD:
         assert int(response['Content-Length']) == len(test_file_content)
         assert b''.join(response.streaming_content) == test_file_content
 
+    def test_retrieve_file_attachment_x_accel(self, settings, auth_api_test_client, file_attachment):
+        """Тест отдачи файла через nginx по X-Accel-Redirect."""
+        settings.FILE_ATTACHMENT_DOWNLOAD_MODE = 'x-accel'
+
+        response = auth_api_test_client.api_client.get(f'{self.BASE_URL}{file_attachment.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['X-Accel-Redirect'] == f'/protected-media/{file_attachment.file.name}'
+        assert response.content == b''
+
+    def test_retrieve_file_attachment_not_modified(self, auth_api_test_client, file_attachment):
+        """Тест условного запроса файла."""
+        url = f'{self.BASE_URL}{file_attachment.id}/'
+        etag = auth_api_test_client.api_client.get(url)['ETag']
+
+        response = auth_api_test_client.api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize(
+        'byte_range, expected_status, expected_content, expected_content_range',
+        [
+            ('bytes=0-3', status.HTTP_206_PARTIAL_CONTENT, b'file', 'bytes 0-3/12'),
+            ('bytes=5-', status.HTTP_206_PARTIAL_CONTENT, b'content', 'bytes 5-11/12'),
+            ('bytes=-4', status.HTTP_206_PARTIAL_CONTENT, b'tent', 'bytes 8-11/12'),
+            ('bytes=20-30', status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, b'', 'bytes */12'),
+        ],
+    )
+    def test_retrieve_file_attachment_range(
+        self,
+        auth_api_test_client,
+        file_attachment,
+        byte_range,
+        expected_status,
+        expected_content,
+        expected_content_range,
+    ):
+        """Тест получения части файла."""
+        response = auth_api_test_client.api_client.get(
+            f'{self.BASE_URL}{file_attachment.id}/',
+            HTTP_RANGE=byte_range,
+        )
+
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        assert response.status_code == expected_status
+        assert response['Content-Range'] == expected_content_range
+        assert content == expected_content
+
     def test_delete_file_attachment(self, auth_api_test_client, warehouse, file_attachment):
         """Тест удаления вложения."""
 
@@ -101,3 +215,36 @@ class TestFileAttachmentCRUD:
             f'{self.BASE_URL}{file_attachment.id}/',
             expected_status=status.HTTP_403_FORBIDDEN,
         )
+
+    def test_create_file_attachment_of_another_user(self, auth_api_test_client, warehouse_another_user):
+        """Тест ошибки при попытке прикрепить файл к чужому объекту."""
+        data = {
+            'content_type': ContentTypeChoices.WAREHOUSE,
+            'object_id': warehouse_another_user.id,
+            'file': SimpleUploadedFile('test_file.txt', b'file_content'),
+        }
+
+        response = auth_api_test_client.post(
+            self.BASE_URL,
+            data=data,
+            format='multipart',
+            expected_status=status.HTTP_400_BAD_REQUEST,
+        )
+
+        assert 'object_id' in response
+        assert not FileAttachment.objects.exists()
+
+    def test_file_attachment_permission_does_not_load_object(self, auth_api_test_client, material):
+        """Проверка прав на вложение не загружает объект, к которому оно прикреплено."""
+        attachment = FileAttachment.objects.create(
+            content_type=ContentType.objects.get_for_model(material),
+            object_id=material.id,
+            file=SimpleUploadedFile('test_file.txt', b'file_content'),
+        )
+        assert attachment.owner_id == material.warehouse.user_id
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_api_test_client.delete(f'{self.BASE_URL}{attachment.id}/')
+
+        assert not any('warehouse_material' in query['sql'] for query in queries.captured_queries)
+        assert not any('warehouse_warehouse' in query['sql'] for query in queries.captured_queries)
@@ -1,7 +1,16 @@
+import json
+from decimal import Decimal
+
 import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
-from apps.warehouse.models import Category, Material
+from apps.warehouse.models import Category, Material, Product, ProductComponent, StockMovement
+from apps.warehouse.services.material.service import MaterialService
+from tests.common.drf_api_client import ApiTestClientAuth
 
 
 @pytest.mark.django_db
@@ -19,6 +28,24 @@ class TestMaterialCRUD:
         assert data[0]['id'] == material.id
         assert data[0]['title'] == material.title
 
+    def test_get_material_list_keyset_pagination(self, mixer, auth_api_test_client, warehouse_material, unit):
+        """Тест получения списка материалов с пагинацией по ключу."""
+        materials = mixer.cycle(15).blend(Material, warehouse=warehouse_material, unit=unit)
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}?pagination=keyset'
+
+        first_page = auth_api_test_client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            second_page = auth_api_test_client.get(first_page['next'])
+
+        assert 'count' not in first_page
+        assert len(first_page['results']) == 10
+        assert len(second_page['results']) == 5
+        assert second_page['next'] is None
+        assert {item['id'] for item in first_page['results'] + second_page['results']} == {
+            material.id for material in materials
+        }
+        assert not any('COUNT(' in query['sql'] for query in queries.captured_queries)
+
     def test_get_material_detail(self, auth_api_test_client, warehouse_material, material):
         """Тест получения одного материала."""
         url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}{material.id}/'
@@ -30,6 +57,43 @@ class TestMaterialCRUD:
         assert len(response['categories']) == material.categories.count()
         assert response['unit']['title'] == material.unit.translations.filter(language_code='ru').first().title
 
+    def test_get_material_detail_single_query(self, auth_api_test_client, warehouse_material, material):
+        """Склад и владелец проверяются в запросе материала, без отдельной загрузки склада."""
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}{material.id}/'
+        auth_api_test_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_api_test_client.get(url)
+
+        assert not any(query['sql'].startswith('SELECT "warehouse_warehouse"') for query in queries.captured_queries)
+
+    def test_get_material_list_cached(self, auth_api_test_client, warehouse_material, material, material_data):
+        """Повторный запрос списка отдается из кэша, изменение материала сбрасывает кэш."""
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        auth_api_test_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_api_test_client.get(url)
+
+        assert not any('warehouse_material' in query['sql'] for query in queries.captured_queries)
+
+        material_data['title'] = 'Updated title'
+        auth_api_test_client.put(f'{url}{material.id}/', data=material_data)
+        response = auth_api_test_client.get(url)
+
+        assert response['results'][0]['title'] == 'Updated title'
+
+    def test_get_material_list_cache_per_user(self, auth_api_test_client, another_user, warehouse_material, material):
+        """Закэшированный ответ не отдается другому пользователю."""
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        auth_api_test_client.get(url)
+
+        ApiTestClientAuth(user=another_user).get(url, expected_status=status.HTTP_403_FORBIDDEN)
+
+    def test_get_material_list_unknown_warehouse(self, auth_api_test_client):
+        """Тест получения списка материалов несуществующего склада."""
+        auth_api_test_client.get(self.BASE_URL.format(warehouse_id=999999), expected_status=status.HTTP_404_NOT_FOUND)
+
     def test_create_material(self, auth_api_test_client, warehouse_material, unit, material_data):
         """Тест создания материала."""
         url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
@@ -51,6 +115,32 @@ class TestMaterialCRUD:
         material.refresh_from_db()
         assert material.title == material_data['title']
 
+    def test_update_material_keeps_remaining(self, auth_api_test_client, warehouse_material, material, material_data):
+        """Остаток не меняется обновлением материала, в том числе изменением после загрузки объекта."""
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}{material.id}/'
+        material_data['remaining'] = '999'
+
+        response = auth_api_test_client.put(url, data=material_data)
+
+        assert Decimal(response['remaining']) == material.remaining
+        service = MaterialService(
+            warehouse=warehouse_material,
+            unit=material.unit,
+            title='Updated Title',
+            sku=material.sku,
+            notes=material.notes,
+            price=material.price,
+            min_remaining=material.min_remaining,
+            categories_id=[],
+        )
+        Material.objects.filter(id=material.id).update(remaining=material.remaining + 5)
+        service.update(material)
+
+        material.refresh_from_db()
+        assert material.title == 'Updated Title'
+        assert material.remaining == Decimal('15')
+        assert not StockMovement.objects.exists()
+
     def test_delete_material(self, auth_api_test_client, warehouse_material, material):
         """Тест удаления материала."""
         url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}{material.id}/'
@@ -76,6 +166,126 @@ class TestMaterialCRUD:
         assert 'categories' in response
         assert 'Исключите категории не принадлежащие складу' in response['categories']
 
+    def test_create_material_wrong_category_type(
+        self, auth_api_test_client, warehouse_material, material_data, category_product
+    ):
+        """Тест создания материала с категорией склада неподходящего типа."""
+        warehouse_material.categories.add(category_product)
+        material_data['categories'].append(category_product.id)
+
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        response = auth_api_test_client.post(url, data=material_data, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert 'Категории не соответствуют допустимым типам' in response['categories']
+        assert category_product.title in response['categories']
+
+    def test_import_materials_csv(self, auth_api_test_client, warehouse_material, unit, category_material):
+        """Тест пакетного импорта материалов из CSV."""
+        content = (
+            'title,sku,price,remaining,min_remaining,unit_id,category_ids\n'
+            f'First,SKU-1,10.50,5,,{unit.id},{category_material.id}\n'
+            f'Second,,20,,1.5,{unit.id},\n'
+        )
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}import/'
+        response = auth_api_test_client.post(
+            url,
+            data={'file': SimpleUploadedFile('materials.csv', content.encode()), 'file_format': 'csv'},
+            format='multipart',
+        )
+
+        assert response['created'] == 2
+        first = Material.objects.get(warehouse=warehouse_material, title='First')
+        second = Material.objects.get(warehouse=warehouse_material, title='Second')
+        assert first.sku == 'SKU-1'
+        assert first.min_remaining is None
+        assert list(first.categories.all()) == [category_material]
+        assert second.remaining == 0
+        assert not second.categories.exists()
+
+    def test_import_materials_ndjson_errors(self, mixer, auth_api_test_client, warehouse_material, unit):
+        """Тест импорта материалов с ошибками в строках."""
+        foreign_category = mixer.blend(Category)
+        rows = [
+            {'title': 'Valid', 'price': '1.00', 'unit_id': unit.id},
+            {'title': 'No price', 'unit_id': unit.id},
+            {'title': 'Wrong unit', 'price': '1.00', 'unit_id': 999999},
+            {'title': 'Wrong category', 'price': '1.00', 'unit_id': unit.id, 'category_ids': [foreign_category.id]},
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n'
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}import/'
+        response = auth_api_test_client.post(
+            url,
+            data={'file': SimpleUploadedFile('materials.ndjson', content.encode())},
+            format='multipart',
+            expected_status=status.HTTP_400_BAD_REQUEST,
+        )
+
+        assert set(response['rows']) == {'1', '2', '3', '4'}
+        assert 'price' in response['rows']['1']
+        assert 'unit_id' in response['rows']['2']
+        assert 'Исключите категории не принадлежащие складу' in response['rows']['3']['category_ids']
+        assert 'non_field_errors' in response['rows']['4']
+        assert not Material.objects.filter(warehouse=warehouse_material).exists()
+
+    @pytest.mark.parametrize(
+        ('content', 'file_format'),
+        [
+            ('title,price\nКирпич,10\n'.encode('cp1251'), 'csv'),
+            (b'title,price\n' + b'a' * 200_000 + b',10\n', 'csv'),
+            ('{"title": "Кирпич"}\n'.encode('cp1251'), 'ndjson'),
+        ],
+    )
+    def test_import_materials_invalid_file(self, auth_api_test_client, warehouse_material, content, file_format):
+        """Тест импорта файла не в UTF-8 или с некорректным CSV."""
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse_material.id)}import/'
+        response = auth_api_test_client.post(
+            url,
+            data={'file': SimpleUploadedFile(f'materials.{file_format}', content), 'file_format': file_format},
+            format='multipart',
+            expected_status=status.HTTP_400_BAD_REQUEST,
+        )
+
+        assert 'file' in response
+        assert not Material.objects.filter(warehouse=warehouse_material).exists()
+
+    def test_get_material_where_used(
+        self, mixer, auth_api_test_client, warehouse, warehouse_material, material, component, unit_same_group
+    ):
+        """Продукты, использующие материал, с количеством в ед. измерений материала."""
+        another_product = mixer.blend(Product, warehouse=warehouse, unit=component.unit)
+        mixer.blend(
+            ProductComponent,
+            product=another_product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=material.id,
+            unit=unit_same_group,
+            quantity=Decimal('250'),
+        )
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_api_test_client.get(f'{url}{material.id}/where-used/')
+
+        assert [(item['product_id'], item['quantity'], item['unit_id']) for item in response] == [
+            (component.product_id, '10.0000', material.unit_id),
+            (another_product.id, '2.5000', material.unit_id),
+        ]
+        assert len([query for query in context.captured_queries if 'warehouse_productcomponent' in query['sql']]) == 1
+
+    def test_get_materials_where_used_batch(self, mixer, auth_api_test_client, warehouse_material, material, component):
+        """Использование нескольких материалов одним запросом, чужие и несуществующие id отклоняются."""
+        unused_material = mixer.blend(Material, warehouse=warehouse_material, unit=material.unit)
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id) + 'where-used/'
+
+        response = auth_api_test_client.get(f'{url}?ids={material.id}&ids={unused_material.id}')
+
+        assert [(item['object_id'], item['product_id']) for item in response] == [(material.id, component.product_id)]
+
+        response = auth_api_test_client.get(
+            f'{url}?ids={material.id}&ids=0', expected_status=status.HTTP_400_BAD_REQUEST
+        )
+        assert 'ids' in response
+
     def test_unauthenticated_access(self, api_test_client, warehouse_material):
         """Тест доступа без аутентификации."""
         api_test_client.get(
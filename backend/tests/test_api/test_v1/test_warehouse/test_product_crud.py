@@ -1,15 +1,23 @@
+import json
 from decimal import Decimal
 
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
+from api.v1.warehouse.serializers import ProductListSerializer
 from apps.warehouse.choices import ProductComponentChoices
 from apps.warehouse.models import (
     Material,
     Product,
     ProductComponent,
+    Resource,
 )
+from apps.warehouse.services.dto import ProductComponentDTO
+from apps.warehouse.services.product import ProductCreateService
 
 
 @pytest.mark.django_db
@@ -26,6 +34,78 @@ class TestProductCRUD:
         assert len(data) == 1
         assert data[0]['id'] == product.id
 
+    def test_get_product_list_sparse_fields(self, auth_api_test_client, warehouse, product, category_product):
+        """Список продуктов с fields отдает только запрошенные поля без загрузки связей."""
+        product.categories.add(category_product)
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}?fields=id,title,price'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_api_test_client.get(url)
+
+        assert response['results'] == [{'id': product.id, 'title': product.title, 'price': str(product.price)}]
+        sql = [query['sql'] for query in queries.captured_queries]
+        assert not any('warehouse_category' in query for query in sql)
+        assert not any('FROM "warehouse_product"' in query and '"unit_unit"' in query for query in sql)
+
+    def test_get_product_list_expand(self, auth_api_test_client, warehouse, product, unit, category_product):
+        """Связи вне expand отдаются id, связи из expand - вложенными объектами."""
+        product.categories.add(category_product)
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}?fields=id,unit,categories&expand=unit'
+
+        data = auth_api_test_client.get(url)['results'][0]
+
+        assert data['unit']['id'] == unit.id
+        assert data['categories'] == [category_product.id]
+
+    def test_get_product_list_queries_do_not_depend_on_page_size(
+        self, settings, mixer, auth_api_test_client, warehouse, product, unit
+    ):
+        """Количество запросов списка продуктов не зависит от количества строк."""
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        url = self.BASE_URL.format(warehouse_id=warehouse.id)
+        auth_api_test_client.get(url)
+
+        with CaptureQueriesContext(connection) as single_product:
+            auth_api_test_client.get(url)
+
+        mixer.cycle(5).blend(Product, warehouse=warehouse, unit=unit)
+
+        with CaptureQueriesContext(connection) as many_products:
+            response = auth_api_test_client.get(url)
+
+        assert len(response['results']) == 6
+        assert all(item['unit']['title'] == 'Метры' for item in response['results'])
+        assert len(many_products) == len(single_product)
+
+    @pytest.mark.parametrize('query', ['', '?pagination=keyset'])
+    def test_get_product_list_flat_parity(
+        self, mixer, auth_api_test_client, warehouse, product, unit_same_group, categories_list, query
+    ):
+        """Плоский сериализатор списка продуктов отдает то же, что и ProductListSerializer."""
+        product.categories.add(*categories_list)
+        mixer.blend(
+            Product,
+            warehouse=warehouse,
+            unit=unit_same_group,
+            price=Decimal('10.5'),
+            remaining=Decimal('3'),
+            min_remaining=None,
+            notes='',
+        )
+
+        response = auth_api_test_client.get(f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{query}')
+
+        expected = ProductListSerializer(Product.objects.filter(warehouse=warehouse), many=True).data
+        assert response['results'] == json.loads(json.dumps(expected))
+
+    def test_get_product_list_rendered_as_drf_json(self, auth_api_test_client, warehouse, product, category_product):
+        """Ответ, отрисованный orjson, совпадает с выводом JSONRenderer DRF."""
+        product.categories.add(category_product)
+        response = auth_api_test_client.api_client.get(self.BASE_URL.format(warehouse_id=warehouse.id))
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data)
+
     def test_get_product_detail(self, auth_api_test_client, warehouse, product):
         """Успешное получение деталей продукта."""
         url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{product.id}/'
@@ -34,6 +114,57 @@ class TestProductCRUD:
         assert response['id'] == product.id
         assert response['title'] == product.title
 
+    def test_get_product_detail_components(
+        self, settings, mixer, auth_api_test_client, warehouse, product, component, material, unit
+    ):
+        """Компоненты отдаются с материалами и ресурсами, число запросов не зависит от размера состава."""
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        resource = mixer.blend(
+            Resource,
+            user=warehouse.user,
+            unit=unit,
+            is_depreciation=True,
+            price=None,
+            initial_price=Decimal('2000.00'),
+            service_life=Decimal('5'),
+        )
+        mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Resource),
+            object_id=resource.id,
+            unit=unit,
+            quantity=Decimal('1'),
+        )
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{product.id}/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_api_test_client.get(url)
+
+        components = {item['content_type']: item['component'] for item in response['components']}
+        assert components[ProductComponentChoices.MATERIAL] == {
+            'id': material.id,
+            'title': material.title,
+            'unit': {'id': unit.id, 'title': 'Метры', 'short_title': 'м'},
+            'price': '100.50',
+        }
+        assert components[ProductComponentChoices.RESOURCE]['price'] == '400.00'
+
+        for extra_material in mixer.cycle(3).blend(Material, warehouse=material.warehouse, unit=unit):
+            mixer.blend(
+                ProductComponent,
+                product=product,
+                content_type=ContentType.objects.get_for_model(Material),
+                object_id=extra_material.id,
+                unit=unit,
+                quantity=Decimal('1'),
+            )
+        with CaptureQueriesContext(connection) as more_context:
+            response = auth_api_test_client.get(url)
+
+        assert len(response['components']) == 5
+        assert len(more_context.captured_queries) == len(context.captured_queries)
+
     def test_create_product(self, auth_api_test_client, warehouse, unit, product_data):
         """Успешное создание продукта."""
         url = self.BASE_URL.format(warehouse_id=warehouse.id)
@@ -43,6 +174,66 @@ class TestProductCRUD:
         assert new_product.title == product_data['title']
         assert new_product.components.count() == 1
 
+    def test_create_product_components_queries_do_not_depend_on_count(
+        self, mixer, auth_user, warehouse, warehouse_material, unit
+    ):
+        """Количество запросов сохранения компонентов не зависит от их количества."""
+        materials = mixer.cycle(10).blend(Material, warehouse=warehouse_material, unit=unit)
+
+        def create_product(components_count: int) -> CaptureQueriesContext:
+            service = ProductCreateService(
+                warehouse=warehouse,
+                unit=unit,
+                title='Product',
+                sku='',
+                notes='',
+                price=Decimal('1.0'),
+                remaining=Decimal('1.0'),
+                min_remaining=Decimal('1.0'),
+                categories_id=[],
+                components=[
+                    ProductComponentDTO(
+                        content_type=ProductComponentChoices.MATERIAL,
+                        object_id=material.id,
+                        quantity=Decimal('1.0'),
+                        unit=unit,
+                        user_id=auth_user.id,
+                    )
+                    for material in materials[:components_count]
+                ],
+            )
+            with CaptureQueriesContext(connection) as queries:
+                product = service.create()
+            assert product.components.count() == components_count
+            return queries
+
+        create_product(1)
+
+        assert len(create_product(10)) == len(create_product(1))
+
+    def test_create_product_components_errors_by_index(
+        self, auth_api_test_client, warehouse, product_data, material, material_another_user, unit_another
+    ):
+        """Ошибки компонентов возвращаются по индексу компонента."""
+        url = self.BASE_URL.format(warehouse_id=warehouse.id)
+        valid_component = product_data['components'][0]
+        product_data['components'] = [
+            valid_component,
+            {**valid_component, 'quantity': '-1'},
+            {**valid_component, 'object_id': material_another_user.id},
+            {**valid_component, 'unit': unit_another.id},
+            valid_component,
+        ]
+
+        response = auth_api_test_client.post(url, data=product_data, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert set(response['components']) == {'1', '2', '3', '4'}
+        assert 'quantity' in response['components']['1']
+        assert 'content_type' in response['components']['2']
+        assert 'unit' in response['components']['3']
+        assert response['components']['4']['object_id'] == 'Компонент уже находится в составе продукта'
+        assert not Product.objects.filter(title=product_data['title']).exists()
+
     def test_update_product(self, auth_api_test_client, warehouse, product, product_data):
         """Успешное обновление продукта."""
         url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{product.id}/'
@@ -121,6 +312,47 @@ class TestProductCRUD:
         assert 'components' in response
         assert response['components']['0']['object_id'] == 'Компонент уже находится в составе продукта'
 
+    def test_update_product_components_move_into_freed_slot(
+        self, mixer, auth_api_test_client, warehouse, product, product_data, component, material, unit
+    ):
+        """Компонент занимает объект, который освобождает другой компонент того же запроса; обмен отклоняется."""
+        second_material, third_material = mixer.cycle(2).blend(Material, warehouse=material.warehouse, unit=unit)
+        second_component = mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=second_material.id,
+            unit=unit,
+            quantity=Decimal('1'),
+        )
+        url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{product.id}/'
+
+        def component_data(component_id: int, object_id: int) -> dict:
+            return {
+                'id': component_id,
+                'quantity': '1',
+                'unit': unit.id,
+                'content_type': ProductComponentChoices.MATERIAL,
+                'object_id': object_id,
+            }
+
+        product_data['components'] = [
+            component_data(second_component.id, third_material.id),
+            component_data(component.id, second_material.id),
+        ]
+        auth_api_test_client.put(url, data=product_data)
+
+        component.refresh_from_db()
+        second_component.refresh_from_db()
+        assert (component.object_id, second_component.object_id) == (second_material.id, third_material.id)
+
+        product_data['components'] = [
+            component_data(component.id, third_material.id),
+            component_data(second_component.id, second_material.id),
+        ]
+        response = auth_api_test_client.put(url, data=product_data, expected_status=status.HTTP_400_BAD_REQUEST)
+        assert response['components']['0']['object_id'] == 'Компонент уже находится в составе продукта'
+
     def test_delete_product(self, auth_api_test_client, warehouse, product):
         """Успешное удаление продукта."""
         url = f'{self.BASE_URL.format(warehouse_id=warehouse.id)}{product.id}/'
@@ -1,9 +1,10 @@
 from decimal import Decimal
 
 import pytest
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import status
 
-from apps.warehouse.models import Resource
+from apps.warehouse.models import ProductComponent, Resource
 
 
 @pytest.mark.django_db
@@ -110,6 +111,24 @@ class TestResourceCRUD:
         )
         assert 'price' in response
 
+    def test_get_resource_where_used(self, mixer, auth_api_test_client, resource, product, unit_same_group):
+        """Продукты, использующие ресурс, с количеством в ед. измерений ресурса."""
+        component = mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Resource),
+            object_id=resource.id,
+            unit=unit_same_group,
+            quantity=Decimal('40'),
+        )
+
+        response = auth_api_test_client.get(f'{self.BASE_URL}{resource.id}/where-used/')
+
+        assert len(response) == 1
+        assert response[0]['component_id'] == component.id
+        assert response[0]['quantity'] == '0.4000'
+        assert response[0]['component_quantity'] == '40.00'
+
     def test_unauthenticated_access(self, api_test_client):
         """Тест доступа без аутентификации."""
         api_test_client.get(self.BASE_URL, expected_status=status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,197 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.warehouse.choices import StockMovementReasonChoices
+from apps.warehouse.models import Material, ProductComponent, StockMovement
+
+
+@pytest.mark.django_db
+class TestStockMovement:
+    BASE_URL = '/api/v1/warehouse/{warehouse_id}/stock-movements/'
+
+    def test_adjust_remaining(self, mixer, auth_api_test_client, warehouse_material, material, unit):
+        """Пакет изменений применяется к остаткам и записывается в журнал с остатком после каждого изменения."""
+        another_material = mixer.blend(Material, warehouse=warehouse_material, unit=unit, remaining=Decimal('1'))
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        data = {
+            'adjustments': [
+                {'entity_id': material.id, 'delta': '5', 'reason': StockMovementReasonChoices.RECEIPT},
+                {'entity_id': another_material.id, 'delta': '0.5'},
+                {'entity_id': material.id, 'delta': '-2.25', 'reason': StockMovementReasonChoices.WRITE_OFF},
+            ]
+        }
+
+        response = auth_api_test_client.post(url, data=data)
+
+        assert [item['remaining'] for item in response] == ['15.0000', '1.5000', '12.7500']
+        assert response[1]['reason'] == StockMovementReasonChoices.ADJUSTMENT
+        material.refresh_from_db()
+        another_material.refresh_from_db()
+        assert material.remaining == Decimal('12.75')
+        assert another_material.remaining == Decimal('1.5')
+        assert StockMovement.objects.filter(object_id=material.id).count() == 2
+
+    def test_adjust_remaining_insufficient(self, auth_api_test_client, warehouse_material, material):
+        """Изменение, уводящее остаток в минус, отклоняется целиком."""
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        data = {
+            'adjustments': [
+                {'entity_id': material.id, 'delta': '-4'},
+                {'entity_id': material.id, 'delta': '-7'},
+            ]
+        }
+
+        response = auth_api_test_client.post(url, data=data, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert 'delta' in response['adjustments']['1']
+        material.refresh_from_db()
+        assert material.remaining == Decimal('10')
+        assert not StockMovement.objects.exists()
+
+    def test_adjust_remaining_unknown_entity(
+        self, auth_api_test_client, warehouse_material, material, material_another_user
+    ):
+        """Объект другого склада не изменяется."""
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        data = {
+            'adjustments': [
+                {'entity_id': material.id, 'delta': '1'},
+                {'entity_id': material_another_user.id, 'delta': '1'},
+            ]
+        }
+
+        response = auth_api_test_client.post(url, data=data, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert 'entity_id' in response['adjustments']['1']
+        material_another_user.refresh_from_db()
+        assert material_another_user.remaining == Decimal('10')
+
+    def test_adjust_remaining_invalidates_cache(self, auth_api_test_client, warehouse_material, material):
+        """После изменения остатков список материалов отдает новые остатки."""
+        materials_url = f'/api/v1/warehouse/{warehouse_material.id}/materials/'
+        auth_api_test_client.get(materials_url)
+
+        auth_api_test_client.post(
+            self.BASE_URL.format(warehouse_id=warehouse_material.id),
+            data={'adjustments': [{'entity_id': material.id, 'delta': '1'}]},
+        )
+
+        assert auth_api_test_client.get(materials_url)['results'][0]['remaining'] == '11.0000'
+
+    def test_get_stock_movement_list(self, mixer, auth_api_test_client, warehouse_material, material, unit):
+        """Журнал фильтруется по объекту склада."""
+        another_material = mixer.blend(Material, warehouse=warehouse_material, unit=unit, remaining=Decimal('1'))
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        auth_api_test_client.post(
+            url,
+            data={
+                'adjustments': [
+                    {'entity_id': material.id, 'delta': '1'},
+                    {'entity_id': another_material.id, 'delta': '1'},
+                ]
+            },
+        )
+
+        response = auth_api_test_client.get(f'{url}?entity_id={material.id}')
+
+        assert [item['entity_id'] for item in response['results']] == [material.id]
+
+    def test_delete_stock_movement_not_allowed(self, auth_api_test_client, warehouse_material, material):
+        """Записи журнала нельзя удалить."""
+        url = self.BASE_URL.format(warehouse_id=warehouse_material.id)
+        movement = auth_api_test_client.post(url, data={'adjustments': [{'entity_id': material.id, 'delta': '1'}]})[0]
+
+        auth_api_test_client.delete(f'{url}{movement["id"]}/', expected_status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_produce(self, mixer, auth_api_test_client, warehouse, product, component, material, unit_same_group):
+        """Производство списывает материалы состава и увеличивает остаток продукта фиксированным числом UPDATE."""
+        another_material = mixer.blend(
+            Material, warehouse=material.warehouse, unit=material.unit, remaining=Decimal('5')
+        )
+        mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=another_material.id,
+            unit=unit_same_group,
+            quantity=Decimal('50'),
+        )
+        product_remaining = product.remaining
+        url = f'/api/v1/warehouse/{warehouse.id}/products/{product.id}/produce/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_api_test_client.post(
+                url, data={'quantity': '1', 'comment': 'Партия 1'}, expected_status=status.HTTP_201_CREATED
+            )
+
+        assert {(item['warehouse'], item['entity_id'], item['delta']) for item in response} == {
+            (material.warehouse_id, material.id, '-10.0000'),
+            (material.warehouse_id, another_material.id, '-0.5000'),
+            (warehouse.id, product.id, '1.0000'),
+        }
+        assert {item['reason'] for item in response} == {StockMovementReasonChoices.PRODUCTION}
+        material.refresh_from_db()
+        another_material.refresh_from_db()
+        product.refresh_from_db()
+        assert material.remaining == Decimal('0')
+        assert another_material.remaining == Decimal('4.5')
+        assert product.remaining == product_remaining + 1
+        assert len([query for query in context.captured_queries if query['sql'].startswith('UPDATE')]) == 2
+
+    def test_produce_rounds_consumption_up(
+        self, mixer, auth_api_test_client, warehouse, product, component, material, unit_same_group
+    ):
+        """Расход меньше точности остатка округляется вверх, компонент с нулевым количеством не списывается."""
+        component.unit = unit_same_group
+        component.quantity = Decimal('0.01')
+        component.save()
+        another_material = mixer.blend(
+            Material, warehouse=material.warehouse, unit=material.unit, remaining=Decimal('5')
+        )
+        mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=another_material.id,
+            unit=material.unit,
+            quantity=Decimal('0'),
+        )
+        url = f'/api/v1/warehouse/{warehouse.id}/products/{product.id}/produce/'
+
+        response = auth_api_test_client.post(url, data={'quantity': '0.5'}, expected_status=status.HTTP_201_CREATED)
+
+        assert {(item['entity_id'], item['delta']) for item in response} == {
+            (material.id, '-0.0001'),
+            (product.id, '0.5000'),
+        }
+        material.refresh_from_db()
+        another_material.refresh_from_db()
+        assert material.remaining == Decimal('9.9999')
+        assert another_material.remaining == Decimal('5')
+
+    def test_produce_insufficient(self, auth_api_test_client, warehouse, product, component, material):
+        """Партия, для которой не хватает материала, не производится."""
+        url = f'/api/v1/warehouse/{warehouse.id}/products/{product.id}/produce/'
+
+        response = auth_api_test_client.post(url, data={'quantity': '2'}, expected_status=status.HTTP_400_BAD_REQUEST)
+
+        assert str(component.id) in response['components']
+        material.refresh_from_db()
+        assert material.remaining == Decimal('10')
+        assert not StockMovement.objects.exists()
+
+    def test_has_warehouse_of_another_user_access(self, auth_api_test_client, material_another_user):
+        """Нельзя изменить остатки склада другого пользователя."""
+        url = self.BASE_URL.format(warehouse_id=material_another_user.warehouse_id)
+
+        auth_api_test_client.post(
+            url,
+            data={'adjustments': [{'entity_id': material_another_user.id, 'delta': '1'}]},
+            expected_status=status.HTTP_403_FORBIDDEN,
+        )
+        auth_api_test_client.get(url, expected_status=status.HTTP_403_FORBIDDEN)
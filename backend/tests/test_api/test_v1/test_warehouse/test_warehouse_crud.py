@@ -1,8 +1,21 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
 import pytest
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
+from apps.common.cache import owner_cache_version
+from apps.unit.models import Unit
 from apps.warehouse.choices import StorageTypeChoices
-from apps.warehouse.models import Warehouse
+from apps.warehouse.models import Material, Product, ProductComponent, Resource, Warehouse
 
 
 @pytest.mark.django_db
@@ -20,6 +33,33 @@ class TestWarehouseCRUD:
         assert data[0]['title'] == warehouse.title
         assert data[0]['storage_type']['value'] == warehouse.storage_type
 
+    def test_get_warehouse_list_counts(
+        self, settings, mixer, auth_api_test_client, auth_user, warehouse, product, unit
+    ):
+        """Тест количества объектов складов без отдельного запроса на каждый склад."""
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        auth_api_test_client.get(self.BASE_URL)
+        with CaptureQueriesContext(connection) as single_warehouse:
+            auth_api_test_client.get(self.BASE_URL)
+
+        for _ in range(3):
+            another_warehouse = mixer.blend(
+                Warehouse,
+                user=auth_user,
+                storage_type=StorageTypeChoices.PRODUCT,
+                updated_by=auth_user,
+            )
+            mixer.cycle(2).blend(Product, warehouse=another_warehouse, unit=unit)
+
+        with CaptureQueriesContext(connection) as many_warehouses:
+            response = auth_api_test_client.get(self.BASE_URL)
+
+        counts = {item['id']: item['products_count'] for item in response['results']}
+        assert counts[warehouse.id] == 1
+        assert sorted(counts.values()) == [1, 2, 2, 2]
+        assert all(item['materials_count'] == '-' for item in response['results'])
+        assert len(many_warehouses) == len(single_warehouse)
+
     def test_get_warehouse_detail(self, auth_api_test_client, warehouse, category_product):
         """Тест получения деталей склада."""
         warehouse.categories.add(category_product)
@@ -30,6 +70,244 @@ class TestWarehouseCRUD:
         assert len(response['categories']) == 1
         assert response['categories'][0]['id'] == category_product.id
 
+    def test_get_warehouse_detail_not_modified(self, auth_api_test_client, warehouse):
+        """Повторный запрос склада с If-None-Match возвращает 304 без тела."""
+        url = f'{self.BASE_URL}{warehouse.id}/'
+        client = auth_api_test_client.api_client
+        etag = client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+        assert not any('warehouse_category' in query['sql'] for query in queries.captured_queries)
+
+    def test_get_warehouse_list_etag_changes(self, auth_api_test_client, warehouse, category_product):
+        """ETag списка складов меняется после изменения склада."""
+        client = auth_api_test_client.api_client
+        etag = client.get(self.BASE_URL)['ETag']
+
+        data = {
+            'title': 'Обновлённый склад',
+            'storage_type': warehouse.storage_type,
+            'categories': [category_product.id],
+        }
+        auth_api_test_client.put(f'{self.BASE_URL}{warehouse.id}/', data=data)
+        response = client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_get_warehouse_detail_etag_after_version_loss(self, auth_api_test_client, warehouse):
+        """Повтор версии данных владельца после сброса кэша не приводит к 304 для измененного склада."""
+        url = f'{self.BASE_URL}{warehouse.id}/'
+        client = auth_api_test_client.api_client
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        version_key = owner_cache_version.KEY_TEMPLATE.format(owner_id=warehouse.user_id)
+        version = owner_cache_version.get(warehouse.user_id)
+        etag = client.get(url)['ETag']
+
+        cache.delete(version_key)
+        assert owner_cache_version.get(warehouse.user_id) != version
+
+        # Изменение без сигналов при повторившейся версии владельца
+        Warehouse.objects.filter(id=warehouse.id).update(
+            title='Изменен в обход сервисов', updated_at=warehouse.updated_at + timedelta(seconds=1)
+        )
+        cache.set(version_key, version, timeout=None)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_get_low_stock(
+        self, mixer, auth_api_test_client, warehouse, warehouse_material, material_another_user, unit
+    ):
+        """Позиции с остатком ниже минимального со всех складов пользователя."""
+        low_material = mixer.blend(
+            Material, warehouse=warehouse_material, unit=unit, remaining=Decimal('1'), min_remaining=Decimal('2.5')
+        )
+        mixer.blend(
+            Material, warehouse=warehouse_material, unit=unit, remaining=Decimal('2'), min_remaining=Decimal('2')
+        )
+        mixer.blend(Material, warehouse=warehouse_material, unit=unit, remaining=Decimal('0'), min_remaining=None)
+        low_product = mixer.blend(
+            Product, warehouse=warehouse, unit=unit, remaining=Decimal('0'), min_remaining=Decimal('1')
+        )
+        material_another_user.remaining = Decimal('0')
+        material_another_user.save()
+
+        response = auth_api_test_client.get(f'{self.BASE_URL}low-stock/')
+
+        assert response['count'] == 2
+        assert {(item['entity_type'], item['id'], item['shortage']) for item in response['results']} == {
+            ('material', low_material.id, '1.5000'),
+            ('product', low_product.id, '1.0000'),
+        }
+
+    def test_get_low_stock_after_adjustment(self, auth_api_test_client, warehouse_material, material):
+        """Позиция попадает в список после списания остатка ниже минимального."""
+        assert auth_api_test_client.get(f'{self.BASE_URL}low-stock/')['count'] == 0
+
+        auth_api_test_client.post(
+            f'{self.BASE_URL}{warehouse_material.id}/stock-movements/',
+            data={'adjustments': [{'entity_id': material.id, 'delta': '-9'}]},
+        )
+
+        response = auth_api_test_client.get(f'{self.BASE_URL}low-stock/')
+        assert [item['id'] for item in response['results']] == [material.id]
+
+    def test_get_product_costs(self, mixer, auth_api_test_client, warehouse, product, component, unit_same_group):
+        """Себестоимость с переводом ед. измерений, амортизацией ресурса и удаленным компонентом."""
+        resource = mixer.blend(
+            Resource,
+            user=warehouse.user,
+            unit=component.unit,
+            is_depreciation=True,
+            price=None,
+            initial_price=Decimal('2000.00'),
+            service_life=Decimal('5'),
+        )
+        mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Resource),
+            object_id=resource.id,
+            unit=unit_same_group,
+            quantity=Decimal('50'),
+        )
+        broken_product = mixer.blend(Product, warehouse=warehouse, unit=component.unit)
+        mixer.blend(
+            ProductComponent,
+            product=broken_product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=0,
+            unit=component.unit,
+            quantity=Decimal('1'),
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_api_test_client.get(f'{self.BASE_URL}{warehouse.id}/costs/')
+
+        # 10 м * 100.50 + 0.5 м * 2000 / 5
+        assert {item['product_id']: (item['cost'], item['is_complete']) for item in response} == {
+            product.id: ('1205.00', True),
+            broken_product.id: ('0.00', False),
+        }
+        component_queries = [
+            query for query in context.captured_queries if 'warehouse_productcomponent' in query['sql']
+        ]
+        assert len(component_queries) == 1
+
+    def test_get_product_costs_invalidated(self, auth_api_test_client, warehouse, product, component, material):
+        """Себестоимость берется из кэша и пересчитывается после изменения цены материала."""
+        url = f'{self.BASE_URL}{warehouse.id}/costs/'
+        assert auth_api_test_client.get(url)[0]['cost'] == '1005.00'
+
+        with CaptureQueriesContext(connection) as context:
+            auth_api_test_client.get(url)
+        assert not [query for query in context.captured_queries if 'warehouse_productcomponent' in query['sql']]
+
+        material.price = Decimal('50.00')
+        material.save()
+
+        assert auth_api_test_client.get(url)[0]['cost'] == '500.00'
+
+    def test_get_product_capacity(
+        self, mixer, auth_api_test_client, warehouse, product, component, material, unit_same_group
+    ):
+        """Мощность ограничивает материал с наименьшим выпуском после перевода ед. измерений."""
+        material.remaining = Decimal('100')
+        material.save()
+        scarce_material = mixer.blend(
+            Material, warehouse=material.warehouse, unit=material.unit, remaining=Decimal('1.2')
+        )
+        scarce_component = mixer.blend(
+            ProductComponent,
+            product=product,
+            content_type=ContentType.objects.get_for_model(Material),
+            object_id=scarce_material.id,
+            unit=unit_same_group,
+            quantity=Decimal('40'),
+        )
+        free_product = mixer.blend(Product, warehouse=warehouse, unit=material.unit)
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_api_test_client.get(f'{self.BASE_URL}{warehouse.id}/capacity/')
+
+        assert {item['product_id']: item for item in response} == {
+            product.id: {
+                'product_id': product.id,
+                'capacity': 3,
+                'limiting_component_id': scarce_component.id,
+                'limiting_material_id': scarce_material.id,
+            },
+            free_product.id: {
+                'product_id': free_product.id,
+                'capacity': None,
+                'limiting_component_id': None,
+                'limiting_material_id': None,
+            },
+        }
+        assert len([query for query in context.captured_queries if 'warehouse_productcomponent' in query['sql']]) == 1
+
+    def test_get_product_capacity_non_terminating_ratio(
+        self, auth_api_test_client, warehouse, product, component, material, unit, unit_same_group
+    ):
+        """Мощность не теряет единицу выпуска при бесконечной дроби отношения коэффициентов."""
+        unit_foot = Unit.objects.create(group=unit.group, coefficient=Decimal('0.3048'))
+        material.unit = unit_same_group
+        material.remaining = Decimal('30.48')
+        material.save()
+        component.unit = unit_foot
+        component.quantity = Decimal('1')
+        component.save()
+
+        response = auth_api_test_client.get(f'{self.BASE_URL}{warehouse.id}/capacity/')
+
+        assert response[0]['capacity'] == 1
+
+    def test_export_warehouse_ndjson(self, auth_api_test_client, warehouse_material, material, category_material):
+        """Тест потоковой выгрузки материалов склада в NDJSON."""
+        url = f'{self.BASE_URL}{warehouse_material.id}/export/'
+        response = auth_api_test_client.api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('application/x-ndjson')
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+        assert len(rows) == 1
+        assert rows[0]['id'] == material.id
+        assert Decimal(rows[0]['price']) == material.price
+        assert rows[0]['unit_title'] == material.unit.translations.get(language_code='ru').title
+        assert rows[0]['category_ids'] == [category_material.id]
+        assert rows[0]['category_titles'] == [category_material.title]
+
+    def test_export_warehouse_csv(self, auth_api_test_client, warehouse, product, category_product):
+        """Тест потоковой выгрузки продуктов склада в CSV."""
+        product.categories.add(category_product)
+        url = f'{self.BASE_URL}{warehouse.id}/export/?file_format=csv'
+        response = auth_api_test_client.api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'filename="warehouse_' in response['Content-Disposition']
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        assert len(rows) == 1
+        assert rows[0]['id'] == str(product.id)
+        assert rows[0]['category_ids'] == str(category_product.id)
+
+    def test_export_warehouse_of_another_user(self, auth_api_test_client, warehouse_another_user):
+        """Тест выгрузки чужого склада."""
+        url = f'{self.BASE_URL}{warehouse_another_user.id}/export/'
+        response = auth_api_test_client.api_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_create_warehouse(self, auth_api_test_client, category_product):
         """Тест создания склада."""
         data = {